@@ -0,0 +1,460 @@
+import logging
+import time
+from datetime import datetime
+
+from browser import (SCROLL_PAUSE, RESULT_CARD_SELECTOR, MESSAGE_CONTAINER_XPATH, stream_result_profiles,
+                     close_message_overlay, find_message_editor, find_send_button, new_message_container,
+                     open_profile_message, wait_for)
+from checkpoints import clear_checkpoint, remaining_candidates, save_checkpoint
+from drivers import create_driver, sample_browser_usage, session_is_dead
+from journal import journal_recorded, journal_send, recover_journal
+from ledger import (get_profile_id, load_recipient_ids, is_duplicate_recipient, remaining_quota,
+                    daily_limit_reached, record_sent_message)
+from metrics import start_run, end_run, span, count, export_run
+from search_cache import SEARCH_CACHE_HOURS, load_search_results, save_search_results
+from sessions import (LOGIN_URL, use_saved_session, is_logged_in, lock_session, unlock_session,
+                      seal_session)
+
+
+logger = logging.getLogger(__name__)
+
+# Constants
+MAX_MESSAGES_PER_DAY = 10
+DELAY_BETWEEN_MESSAGES = 10  # seconds
+LOGIN_TIMEOUT = 120  # Increased timeout for CAPTCHA handling
+SEARCH_FILTERS = ('People', '1st')  # result filter buttons clicked after every search, in order
+
+# Selenium is imported inside the functions that drive the browser, so that the scheduler and
+# the CLI can import this module (and bail out early, e.g. when the quota is used up) cheaply
+
+
+def linkedin_login(driver, job, email, password, manual_captcha=True):
+    from selenium.common.exceptions import TimeoutException
+    from selenium.webdriver.common.action_chains import ActionChains
+    from selenium.webdriver.common.by import By
+    from selenium.webdriver.common.keys import Keys
+    from selenium.webdriver.support import expected_conditions as EC
+    from selenium.webdriver.support.ui import WebDriverWait
+
+    try:
+        driver.get(LOGIN_URL)
+        WebDriverWait(driver, 20).until(EC.presence_of_element_located((By.ID, "username")))
+
+        username_input = driver.find_element(By.ID, "username")
+        password_input = driver.find_element(By.ID, "password")
+
+        # Type credentials and wait until each field holds them
+        actions = ActionChains(driver)
+        actions.send_keys_to_element(username_input, email).perform()
+        wait_for(driver, lambda d: username_input.get_attribute("value") == email, replaces=1, timeout=5)
+        actions.send_keys_to_element(password_input, password).perform()
+        wait_for(driver, lambda d: len(password_input.get_attribute("value")) == len(password),
+                 replaces=1, timeout=5)
+        
+        # Click login button
+        driver.find_element(By.XPATH, "//button[@type='submit']").click()
+        
+        # Check for verification page by URL and specific elements
+        try:
+            # Wait for either the feed page or verification page
+            WebDriverWait(driver, 15).until(
+                lambda d: "feed" in d.current_url.lower() or 
+                         "checkpoint/challenge" in d.current_url.lower()
+            )
+            
+            # If we're on verification page
+            if "checkpoint/challenge" in driver.current_url.lower():
+                # Wait for the specific verification input field from the HTML you shared
+                verification_input = WebDriverWait(driver, 15).until(
+                    EC.presence_of_element_located((By.XPATH, 
+                        "//input[@name='pin' and @id='input__email_verification_pin']"))
+                )
+                
+                # Ask whoever is watching the job for the code; approving the sign-in on
+                # another device also ends the wait
+                job.emit('warning', "🔐 LinkedIn Verification Required")
+                verification_code = job.request_input(
+                    "Enter the 6-digit code sent to your email/phone:", timeout=LOGIN_TIMEOUT,
+                    done=lambda: "feed" in driver.current_url.lower())
+                if verification_code:
+                    try:
+                        # Clear and enter the code carefully
+                        verification_input.clear()
+                        for char in verification_code:
+                            verification_input.send_keys(char)
+                            time.sleep(0.1)
+                        
+                        # Submit the form (LinkedIn often auto-submits on 6 digits)
+                        # But we'll also look for a submit button just in case
+                        try:
+                            submit_button = WebDriverWait(driver, 3).until(
+                                EC.element_to_be_clickable((By.XPATH, 
+                                    "//button[contains(text(), 'Submit') or "
+                                    "contains(text(), 'Verify')]")))
+                            submit_button.click()
+                        except:
+                            # If no button found, just press Enter
+                            verification_input.send_keys(Keys.RETURN)
+                        
+                        # Wait for successful login
+                        WebDriverWait(driver, 30).until(
+                            EC.presence_of_element_located((By.XPATH, 
+                                "//input[@aria-label='Search']")))
+                        
+                        job.emit('success', "✅ Verification successful!")
+                        count("sleep_seconds_saved", 2)
+                        return True
+                    except Exception as e:
+                        job.emit('error', f"⚠️ Verification failed: {str(e)}")
+                        return False
+
+        except TimeoutException:
+            # No verification required
+            pass
+        
+        # Handle CAPTCHA if enabled
+        if manual_captcha and "checkpoint/challenge" in driver.current_url.lower():
+            job.emit('warning', "Please complete the CAPTCHA verification if prompted")
+            WebDriverWait(driver, LOGIN_TIMEOUT).until(
+                lambda d: "feed" in d.current_url.lower())
+        
+        # Verify successful login
+        WebDriverWait(driver, 30).until(
+            EC.presence_of_element_located((By.XPATH, "//input[@aria-label='Search']")))
+        
+        logger.info("Successfully logged in")
+        return True
+    
+    except Exception as e:
+        logger.error(f"Login error: {str(e)}")
+        try:
+            error = driver.find_element(By.ID, "error-for-password").text
+            job.emit('error', f"Login failed: {error}")
+        except:
+            job.emit('error', "Login failed. Please check your credentials and try again.")
+        return False
+
+
+def get_profile_info(driver):
+    from selenium.webdriver.common.by import By
+    from selenium.webdriver.support import expected_conditions as EC
+    from selenium.webdriver.support.ui import WebDriverWait
+
+    try:
+        # Get current URL (profile URL)
+        current_url = driver.current_url
+        
+        # Get profile name
+        name_element = WebDriverWait(driver, 10).until(
+            EC.presence_of_element_located((By.XPATH, "//h1[contains(@class, 'text-heading-xlarge')]")))
+        profile_name = name_element.text.strip()
+        
+        return current_url, profile_name
+    except Exception as e:
+        logger.error(f"Error getting profile info: {str(e)}")
+        return None, "Unknown"
+
+
+def search_profiles(driver, job, title, recipient_ids, wanted, browser_stats):
+    """Search for `title` and return the people results that have a Message button.
+
+    Scrolling stops once the results hold `wanted` new recipients (or run out).
+    """
+    from selenium.common.exceptions import TimeoutException
+    from selenium.webdriver.common.by import By
+    from selenium.webdriver.common.keys import Keys
+    from selenium.webdriver.support import expected_conditions as EC
+    from selenium.webdriver.support.ui import WebDriverWait
+
+    # Search for people
+    job.emit('info', f"Searching for people with title: {title}")
+    with span("search"):
+        search_button = WebDriverWait(driver, 20).until(
+            EC.presence_of_element_located((By.XPATH, "//button[@aria-label='Click to start a search']")))
+        search_button.click()
+
+        search_bar = WebDriverWait(driver, 20).until(
+            EC.presence_of_element_located((By.XPATH, "//input[@aria-label='Search']")))
+        search_bar.send_keys(title)
+        search_bar.send_keys(Keys.RETURN)
+
+        # Wait for search results and filter to people
+        WebDriverWait(driver, 20).until(
+            EC.presence_of_element_located((By.CLASS_NAME, "search-results-container")))
+    
+        # Filter people. Cards from before a filter stay in the DOM until the filtered list
+        # replaces them, so each click waits for the first of them to go stale
+        first_card = None
+        for label in SEARCH_FILTERS:
+            if first_card is not None:
+                WebDriverWait(driver, 20).until(EC.staleness_of(first_card))
+            first_card = next(iter(driver.find_elements(By.CSS_SELECTOR, RESULT_CARD_SELECTOR)), None)
+            WebDriverWait(driver, 20).until(
+                EC.element_to_be_clickable((By.XPATH, f"//button[contains(., '{label}')]"))).click()
+        try:
+            wait_for(driver, lambda d: (first_card is None or EC.staleness_of(first_card)(d)) and
+                     EC.presence_of_element_located((By.CSS_SELECTOR, RESULT_CARD_SELECTOR))(d),
+                     replaces=2, timeout=20)
+        except TimeoutException:
+            if first_card is not None and not EC.staleness_of(first_card)(driver):
+                raise  # the last filter never replaced the unfiltered results
+            # no results; reported below as "No profiles found"
+    
+        # Wait for search results to load
+        WebDriverWait(driver, 20).until(
+            EC.presence_of_element_located((By.CSS_SELECTOR, ".search-results-container")))
+    
+    # Scroll and extract new result cards as they load, stopping once there are
+    # enough new recipients
+    profiles = []
+    new_recipients = 0
+    scroll_stats = {}
+    with span("scroll"):
+        for profile in stream_result_profiles(driver, scroll_stats=scroll_stats):
+            profiles.append(profile)
+            if profile['button'] is not None and not is_duplicate_recipient(recipient_ids, profile['url']):
+                new_recipients += 1
+                if new_recipients >= wanted:
+                    break
+    count("profiles", len(profiles))
+    count("scroll_steps", scroll_stats['steps'])
+    count("scroll_seconds_saved", scroll_stats['saved'])
+    # The results page is at its largest once scrolling stops
+    sample_browser_usage(driver, browser_stats)
+    
+    if not profiles:
+        job.emit('warning', "No profiles found in search results")
+        return []
+        
+    job.emit('info', f"Found {len(profiles)} profiles ({new_recipients} new recipients)")
+    job.emit('info', f"Scrolled {scroll_stats['steps']} times in {scroll_stats['waited']:.1f}s, "
+             f"{scroll_stats['saved']:.1f}s faster than fixed {SCROLL_PAUSE}s sleeps")
+    return [profile for profile in profiles if profile['button'] is not None]
+
+
+def new_candidates(profiles, recipient_ids):
+    # Drop recipients that are already in the ledger (or repeated in the list) before any
+    # click, so duplicates cost no browser time. Returns (candidates, duplicates).
+    candidates = []
+    candidate_ids = set()
+    for profile in profiles:
+        profile_id = get_profile_id(profile['url'])
+        if is_duplicate_recipient(recipient_ids, profile['url']) or (profile_id and profile_id in candidate_ids):
+            continue
+        candidate_ids.add(profile_id)
+        candidates.append(profile)
+    return candidates, len(profiles) - len(candidates)
+
+
+def search_and_send_messages(job, title, message, email, password, max_messages=MAX_MESSAGES_PER_DAY,
+                             delay_between_messages=DELAY_BETWEEN_MESSAGES, manual_captcha=True,
+                             allowed_resources=(), resume=False, search_cache_hours=SEARCH_CACHE_HOURS):
+    """Search LinkedIn for people with `title` and message up to today's remaining quota.
+
+    The candidate list and the position in it are checkpointed as the run goes; with `resume`,
+    an interrupted run for the same account and title carries on from there without searching.
+    Search results are cached for `search_cache_hours` (0 disables the cache) and reused while
+    they still hold enough new recipients for today.
+
+    Runs on a job runner's worker thread (or any thread without Streamlit); everything meant
+    for the user is reported through job.emit.
+    """
+    # Sends a crashed run journaled but never recorded count towards today's quota and duplicates
+    recovered = recover_journal()
+    if recovered:
+        job.emit('warning', f"Recovered {recovered} sent messages that an interrupted run had not recorded")
+    if daily_limit_reached(max_messages):
+        job.emit('warning', f"You've already sent the maximum {max_messages} messages today.")
+        return
+
+    from selenium.webdriver.chrome.options import Options
+    from selenium.webdriver.common.by import By
+    
+    recipient_ids = load_recipient_ids()
+    driver = None
+    run = start_run()
+    browser_stats = {}
+    session_lock = None
+    
+    try:
+        # One browser per account across processes, not just within this job runner
+        session_lock = lock_session(email, job)
+        if session_lock is None:
+            job.emit('warning', "Run cancelled before it started")
+            return
+        
+        chrome_options = Options()
+    
+        # Headless mode (no GUI)
+        chrome_options.add_argument("--headless=new")  # New headless mode in Chrome 109+
+        chrome_options.add_argument("--no-sandbox")  # Bypass OS security
+        chrome_options.add_argument("--disable-dev-shm-usage")  # Prevent crashes in Docker/Linux
+        # Reuse this account's browser profile (cookies, HTTP cache) from previous runs
+        use_saved_session(chrome_options, email)
+        # Initialize Chrome driver (chromedriver path is cached until Chrome is updated)
+        startup_stats = {}
+        with span("startup"):
+            driver = create_driver(chrome_options, startup_stats, allowed_resources)
+        count("driver_cache_hit", int(startup_stats['driver_cache_hit']))
+        job.emit('info', f"Browser ready in {startup_stats['ready_seconds']:.1f}s")
+        
+        # Login, unless the saved session is still valid
+        with span("session_probe"):
+            logged_in = is_logged_in(driver)
+        if logged_in:
+            job.emit('info', "Reusing saved LinkedIn session")
+        else:
+            job.emit('info', "Logging in to LinkedIn...")
+            with span("login"):
+                logged_in = linkedin_login(driver, job, email, password, manual_captcha)
+            if not logged_in:
+                # Raised rather than returned, so the job (and `cli.py run`) reports a failure
+                raise RuntimeError("Login failed. Please check your credentials.")
+        
+        remaining_messages = remaining_quota(max_messages)
+        candidates = remaining_candidates(email, title) if resume else []
+        if candidates:
+            # Straight to the people the interrupted run had not reached; no search or scroll
+            candidates, duplicates = new_candidates(candidates, recipient_ids)
+            job.emit('info', f"Resuming with {len(candidates)} remaining candidates")
+        else:
+            if resume:
+                job.emit('info', "Nothing to resume for this title; running a full search")
+            cached = (load_search_results(email, title, SEARCH_FILTERS, search_cache_hours)
+                      if search_cache_hours else None)
+            candidates, duplicates = new_candidates(cached or [], recipient_ids)
+            if cached is not None and len(candidates) >= remaining_messages:
+                job.emit('info', f"Using cached search results ({len(candidates)} new recipients)")
+                count("search_cache_hit", 1)
+            else:
+                if cached is not None:
+                    job.emit('info', "Cached search results are used up; searching again")
+                # With the cache on, harvest enough new recipients for the days the results are reused
+                wanted = remaining_messages + max_messages * int(search_cache_hours // 24)
+                profiles = search_profiles(driver, job, title, recipient_ids, wanted, browser_stats)
+                if profiles and search_cache_hours:
+                    save_search_results(email, title, SEARCH_FILTERS, profiles)
+                candidates, duplicates = new_candidates(profiles, recipient_ids)
+        # The whole list is checkpointed, so candidates beyond today's quota can be resumed later
+        save_checkpoint(email, title, candidates)
+        to_message = candidates[:remaining_messages]
+        
+        if not to_message:
+            job.emit('warning', "No new recipients found or daily limit reached")
+            clear_checkpoint(email, title)
+            return
+            
+        stats = {'sent': 0, 'duplicates': duplicates, 'errors': 0}
+        failed = []  # candidates whose message never went out; kept for a later resume
+        
+        # Send messages
+        for i, profile in enumerate(to_message):
+            # The checkpoint only ever moves past candidates that were sent
+            save_checkpoint(email, title, candidates[i:] + failed)
+            if job.cancelled:
+                job.emit('warning', f"Run cancelled after {stats['sent']} messages")
+                break
+            sent = False
+            try:
+                profile_url = profile['url']
+                profile_name = profile['name']
+                
+                # Update progress
+                progress = (i + 1) / len(to_message)
+                job.set_progress(progress)
+                
+                # Click message button (on the profile page for resumed or cached candidates)
+                with span("message.open"):
+                    # Typing and sending stay inside the bubble this click opens, never one left open before
+                    open_bubbles = driver.find_elements(By.XPATH, MESSAGE_CONTAINER_XPATH)
+                    if profile.get('button') is not None:
+                        driver.execute_script("arguments[0].click();", profile['button'])
+                    else:
+                        open_profile_message(driver, profile_url)
+                    container = wait_for(driver, new_message_container(open_bubbles), replaces=3)
+                
+                job.set_progress(progress, f"Sending message {i+1} of {len(to_message)} to {profile_name}")
+                
+                # Type message
+                with span("message.type"):
+                    find_message_editor(driver, container).send_keys(message)
+                
+                # Send message
+                with span("message.send"):
+                    send_button = find_send_button(container)
+                    driver.execute_script("arguments[0].click();", send_button)
+                    sent = True
+                    # Journaled (fsynced) straight away, so a crash before the ledger write below
+                    # can't lead to this person being messaged again
+                    sent_at = datetime.now()
+                    journal_id = journal_send(email, profile_url, profile_name, title, message, date=sent_at)
+                
+                job.emit('success', f"Message sent to {profile_name}")
+                logger.info(f"Message sent to {profile_name} - {profile_url}")
+
+                stats['sent'] += 1
+                
+                # Record sent message (appends a single row to the ledger)
+                with span("message.record"):
+                    if record_sent_message(email, profile_url, profile_name, title, message, date=sent_at):
+                        journal_recorded(journal_id)
+                recipient_ids.add(get_profile_id(profile_url))
+                
+                # Close chat; a bubble that lingers is not a failed send (it was sent and recorded),
+                # and the next message waits for a bubble of its own
+                with span("message.close"):
+                    if not close_message_overlay(driver, container):
+                        logger.warning(f"Message overlay still open after closing the chat with {profile_name}")
+                
+            except Exception as e:
+                if session_is_dead(e):
+                    # Every remaining candidate would fail the same way. The job fails, and the
+                    # checkpoint still starts at this candidate
+                    raise
+                stats['errors'] += 1
+                if not sent:
+                    failed.append(profile)
+                job.emit('error', f"Failed to send message to recipient {i+1}: {str(e)}")
+                logger.error(f"Error sending message: {str(e)}")
+            
+            # The pacing delay follows every attempt, including failed ones
+            with span("message.pacing"):
+                time.sleep(delay_between_messages)
+        else:
+            # Candidates beyond today's quota and the ones that failed are left for a later resume
+            left = candidates[len(to_message):] + failed
+            if left:
+                save_checkpoint(email, title, left)
+            else:
+                clear_checkpoint(email, title)
+                
+        job.set_progress(1.0, f"Completed! Sent {stats['sent']} messages, skipped {stats['duplicates']} duplicates, {stats['errors']} errors.")
+        job.emit('info', f"Readiness waits saved {run.counters['sleep_seconds_saved']:.1f}s "
+                 f"compared with fixed sleeps")
+        for name, value in stats.items():
+            count(name, value)
+        
+    # Anything else propagates, so the job is reported as failed
+    finally:
+        if driver:
+            sample_browser_usage(driver, browser_stats)
+            count("bytes_transferred", browser_stats.get('bytes', 0))
+            count("requests_finished", browser_stats.get('requests', 0))
+            count("requests_blocked", browser_stats.get('blocked', 0))
+            if 'peak_rss' in browser_stats:
+                count("browser_rss_bytes", browser_stats['peak_rss'])
+            job.emit('info', f"Browser transferred {browser_stats.get('bytes', 0) / 1e6:.1f} MB, "
+                     f"blocked {browser_stats.get('blocked', 0)} requests"
+                     + (f", peak memory {browser_stats['peak_rss'] / 1e6:.0f} MB" if 'peak_rss' in browser_stats else ""))
+            try:
+                driver.quit()
+            except Exception as e:
+                # A crashed browser can't be asked to quit; the lock and metrics below still matter
+                logger.warning(f"Error closing the browser: {str(e)}")
+        if session_lock is not None:
+            # Encrypted (or deleted) while this run still holds the account's session lock
+            seal_session(email)
+        unlock_session(session_lock)
+        end_run()
+        export_run(run)
+        job.emit('metrics', summary=run.summary())
@@ -0,0 +1,98 @@
+"""Per-message composer lookup latency on the stand-in site: every <p> on the page vs. one scoped lookup.
+
+Loads --cards result cards (each adds <p> elements, like the real results page), then for
+--messages cards opens the msg-form overlay and times finding and typing into the message box
+both ways, alternating between them, and prints the median of each. Needs a local
+Chrome/Chromium and chromedriver.
+
+    python benchmarks/bench_composer.py [--cards 10 100 300] [--messages 10]
+"""
+import argparse
+import os
+import statistics
+import sys
+import time
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(BENCH_DIR))
+sys.path.insert(0, BENCH_DIR)
+
+from selenium.webdriver.chrome.options import Options  # noqa: E402
+from selenium.webdriver.common.by import By  # noqa: E402
+from selenium.webdriver.support import expected_conditions as EC  # noqa: E402
+from selenium.webdriver.support.ui import WebDriverWait  # noqa: E402
+
+from browser import (MESSAGE_CONTAINER_XPATH, find_message_editor, harvest_result_cards,  # noqa: E402
+                     scroll_for_more_results)
+from drivers import create_driver  # noqa: E402
+from standin_server import start_server  # noqa: E402
+
+CLOSE_BUTTON_XPATH = ("//button[contains(@class, 'msg-overlay-bubble-header__control')]"
+                      "//*[contains(@data-test-icon, 'close-small')]/ancestor::button")
+
+
+def legacy_message_editor(driver):
+    # The pre-change lookup: wrap every paragraph on the page, then index from the end
+    main_div = WebDriverWait(driver, 10).until(
+        EC.presence_of_element_located((By.XPATH, MESSAGE_CONTAINER_XPATH)))
+    main_div.click()
+    return driver.find_elements(By.TAG_NAME, "p")[-5]
+
+
+def time_lookup(driver, button, lookup):
+    driver.execute_script("arguments[0].click();", button)
+    start = time.perf_counter()
+    lookup(driver).send_keys("Hello")
+    elapsed = time.perf_counter() - start
+    driver.execute_script("arguments[0].click();", driver.find_element(By.XPATH, CLOSE_BUTTON_XPATH))
+    WebDriverWait(driver, 5).until(EC.invisibility_of_element_located((By.XPATH, MESSAGE_CONTAINER_XPATH)))
+    return elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--cards", type=int, nargs="+", default=[10, 100, 300])
+    parser.add_argument("--messages", type=int, default=10)
+    args = parser.parse_args()
+
+    server, base_url = start_server(results=max(args.cards), latency=0)
+    options = Options()
+    options.add_argument("--headless=new")
+    options.add_argument("--no-sandbox")
+    options.add_argument("--disable-dev-shm-usage")
+    driver = create_driver(options)
+    try:
+        driver.get(f"{base_url}/login")
+        driver.find_element(By.ID, "username").send_keys("bench@example.com")
+        driver.find_element(By.ID, "password").send_keys("bench")
+        driver.find_element(By.XPATH, "//button[@type='submit']").click()
+        WebDriverWait(driver, 10).until(EC.presence_of_element_located((By.XPATH, "//input[@aria-label='Search']")))
+
+        print(f"{'cards':>6} {'<p> on page':>12} {'legacy ms':>10} {'scoped ms':>10} {'speedup':>8}")
+        for cards in args.cards:
+            driver.get(f"{base_url}/search/results/people/?keywords=bench")
+            seen = 0
+            while seen < cards:
+                loaded = scroll_for_more_results(driver, seen, timeout=2)
+                if loaded <= seen:
+                    break
+                seen = loaded
+            profiles, _ = harvest_result_cards(driver)
+            buttons = [profile['button'] for profile in profiles[:args.messages]]
+            paragraphs = driver.execute_script("return document.getElementsByTagName('p').length")
+
+            # Alternate the two lookups so neither one gets all the warm caches
+            legacy, scoped = [], []
+            for button in buttons:
+                legacy.append(time_lookup(driver, button, legacy_message_editor))
+                scoped.append(time_lookup(driver, button, find_message_editor))
+            legacy_ms, scoped_ms = statistics.median(legacy) * 1000, statistics.median(scoped) * 1000
+            print(f"{len(profiles):>6} {paragraphs:>12} {legacy_ms:>10.1f} {scoped_ms:>10.1f} "
+                  f"{legacy_ms / scoped_ms:>7.1f}x")
+    finally:
+        driver.quit()
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
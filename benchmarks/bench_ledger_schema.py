@@ -0,0 +1,107 @@
+"""Ledger size and load time: the old all-text table vs. the normalized schema it is upgraded to.
+
+Writes a ledger in the old layout (Email, Title, Date and the full Message text on every
+row), measures it, lets ledger.connect convert it, and measures again.
+
+Run with: python benchmarks/bench_ledger_schema.py [--rows 100000] [--repeat 5]
+"""
+import argparse
+import os
+import sqlite3
+import statistics
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import ledger  # noqa: E402
+
+LEGACY_SCHEMA = """
+CREATE TABLE sent_messages (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    Email TEXT, ProfileURL TEXT, ProfileID TEXT, Name TEXT, Title TEXT, Date TEXT, Message TEXT
+);
+CREATE INDEX idx_sent_messages_profile_id ON sent_messages (ProfileID);
+CREATE INDEX idx_sent_messages_date ON sent_messages (Date);
+CREATE INDEX idx_sent_messages_title ON sent_messages (Title);
+PRAGMA user_version = 1;
+"""
+TITLES = ["Data Scientist", "Software Engineer", "Product Manager", "ML Engineer"]
+TEMPLATE = ("Hi! I came across your profile while looking for {title}s and would love to connect. "
+            "I'm working on a project in this space and think your experience would be a great fit. "
+            "Would you be open to a short call next week? Best regards")
+
+
+def make_legacy_ledger(path, rows):
+    start = datetime.now() - timedelta(days=rows // 10)
+    conn = sqlite3.connect(path)
+    conn.executescript(LEGACY_SCHEMA)
+    with conn:
+        conn.executemany(
+            "INSERT INTO sent_messages (Email, ProfileURL, ProfileID, Name, Title, Date, Message) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?)",
+            ((f"account{i % 3}@example.com", f"https://www.linkedin.com/in/person-{i}/", f"person-{i}",
+              f"Person {i}", TITLES[i % len(TITLES)], (start + timedelta(minutes=i)).isoformat(sep=' '),
+              TEMPLATE.format(title=TITLES[i % len(TITLES)])) for i in range(rows)))
+    conn.execute("VACUUM")
+    conn.close()
+
+
+def legacy_load(path):
+    # load_sent_messages as it was for the old table: strings everywhere, dates parsed per read
+    import pandas as pd
+
+    conn = sqlite3.connect(path)
+    try:
+        df = pd.read_sql_query(
+            "SELECT Email, ProfileURL, Name, Title, Date, Message FROM sent_messages ORDER BY id", conn)
+    finally:
+        conn.close()
+    df['Date'] = pd.to_datetime(df['Date'], errors='coerce')
+    return df
+
+
+def measure(func, repeat):
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func()
+        timings.append(time.perf_counter() - start)
+    return result, statistics.median(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=100_000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "ledger.db")
+        make_legacy_ledger(path, args.rows)
+        legacy_size = os.path.getsize(path)
+        legacy_df, legacy_time = measure(lambda: legacy_load(path), args.repeat)
+
+        start = time.perf_counter()
+        ledger.connect(path).close()
+        upgrade_time = time.perf_counter() - start
+        # Fold the WAL back in so the file size is comparable
+        conn = sqlite3.connect(path)
+        conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+        conn.close()
+        size = os.path.getsize(path)
+        df, load_time = measure(lambda: ledger.load_sent_messages(path), args.repeat)
+
+    assert len(df) == len(legacy_df) and (df['Date'] == legacy_df['Date']).all()
+    print(f"ledger rows: {args.rows}, upgrade took {upgrade_time:.2f}s")
+    print(f"{'':<12} {'file MB':>8} {'load ms':>8} {'DataFrame MB':>13}")
+    for name, file_size, timing, frame in (("old schema", legacy_size, legacy_time, legacy_df),
+                                           ("normalized", size, load_time, df)):
+        print(f"{name:<12} {file_size / 1e6:>8.1f} {timing * 1000:>8.0f} "
+              f"{frame.memory_usage(deep=True).sum() / 1e6:>13.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,123 @@
+"""extract_profiles_from_html benchmark on fixture pages of increasing size.
+
+Compares the original full html.parser soup, the SoupStrainer fallback and the lxml engine.
+Peak memory is measured in a fresh subprocess per engine because lxml allocates outside
+the Python heap, where tracemalloc cannot see it.
+
+Run with: python benchmarks/bench_parsing.py [--sizes 10 100 500 1000] [--repeat 3]
+"""
+import argparse
+import json
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+
+from bs4 import BeautifulSoup, SoupStrainer
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import parsing  # noqa: E402
+from html_fixtures import expected_profiles, render_search_page  # noqa: E402
+
+
+def legacy_extract_profiles_from_html(html_content):
+    # The original implementation, kept here as the baseline
+    soup = BeautifulSoup(html_content, 'html.parser')
+    profiles = []
+    for container in soup.find_all('li', class_=parsing.RESULT_CONTAINER_CLASS):
+        profile = parsing.extract_profile(container)
+        if profile:
+            profiles.append(profile)
+    return profiles
+
+
+RESULT_STRAINER = SoupStrainer('li', class_=parsing.RESULT_CONTAINER_CLASS)
+
+
+def strainer_extract_profiles_from_html(html_content):
+    soup = BeautifulSoup(html_content, parsing.HTML_PARSER, parse_only=RESULT_STRAINER)
+    return [profile for profile in map(parsing.extract_profile,
+                                       soup.find_all('li', class_=parsing.RESULT_CONTAINER_CLASS))
+            if profile]
+
+
+ENGINES = {
+    'legacy': legacy_extract_profiles_from_html,
+    'strainer': strainer_extract_profiles_from_html,
+    'lxml': parsing.extract_profiles_from_html,
+}
+
+
+def peak_memory_growth(engine, html_path):
+    # Runs one parse in a clean interpreter and returns the growth of its peak RSS in bytes
+    output = subprocess.run([sys.executable, __file__, "--child", engine, html_path],
+                            check=True, capture_output=True, text=True).stdout
+    return json.loads(output)["peak_growth"]
+
+
+def peak_rss():
+    # VmHWM is reset on exec; ru_maxrss can carry over the parent's high-water mark on Linux
+    try:
+        with open("/proc/self/status") as f:
+            for line in f:
+                if line.startswith("VmHWM:"):
+                    return int(line.split()[1]) * 1024
+    except OSError:
+        pass
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+
+
+def child(engine, html_path):
+    with open(html_path, encoding="utf-8") as f:
+        html = f.read()
+    before = peak_rss()
+    ENGINES[engine](html)
+    print(json.dumps({"peak_growth": peak_rss() - before}))
+
+
+def best_time(func, html, repeat):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func(html)
+        best = min(best, time.perf_counter() - start)
+    return result, best
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10, 100, 500, 1000])
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--child", nargs=2, metavar=("ENGINE", "HTML_PATH"), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        child(*args.child)
+        return
+
+    tmp = tempfile.TemporaryDirectory()
+
+    print(f"{'cards':>6} {'page KB':>8} {'engine':>9} {'ms':>9} {'speedup':>8} {'peak RSS +MB':>13}")
+    for size in args.sizes:
+        html = render_search_page(size)
+        html_path = os.path.join(tmp.name, f"search_{size}.html")
+        with open(html_path, "w", encoding="utf-8") as f:
+            f.write(html)
+        expected = expected_profiles(size)
+        baseline = None
+        for engine, func in ENGINES.items():
+            profiles, elapsed = best_time(func, html, args.repeat)
+            assert profiles == expected, f"{engine} returned different records"
+            baseline = baseline or elapsed
+            growth = peak_memory_growth(engine, html_path)
+            print(f"{size:>6} {len(html) / 1024:>8.0f} {engine:>9} {elapsed * 1000:>9.1f} "
+                  f"{baseline / elapsed:>7.1f}x {growth / 2**20:>13.1f}")
+    tmp.cleanup()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,93 @@
+"""Profile-ID canonicalization benchmark: row-by-row urlparse vs. the vectorized get_profile_ids.
+
+Builds a ledger-sized column of profile URLs in the shapes LinkedIn hands out for the same
+person (country subdomains, /overlay/ paths, query strings, percent-encoding, mixed case)
+and reports the time per approach and how many distinct recipients each one sees.
+
+Run with: python benchmarks/bench_profile_ids.py [--rows 200000] [--people 50000]
+"""
+import argparse
+import os
+import random
+import sys
+import time
+from urllib.parse import quote, urlparse
+
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import ledger  # noqa: E402
+
+VARIANTS = [
+    "https://www.linkedin.com/in/{slug}/",
+    "https://www.linkedin.com/in/{slug}?miniProfileUrn=urn%3Ali%3Afs_miniProfile%3A{i}",
+    "https://eg.linkedin.com/in/{slug}",
+    "https://www.linkedin.com/in/{slug}/overlay/contact-info/",
+    "https://www.linkedin.com/in/{upper}/",
+    "https://www.linkedin.com/in/{encoded}/",
+]
+
+
+def legacy_profile_id(url):
+    # The pre-canonicalization get_profile_id, applied row by row
+    if not isinstance(url, str):
+        return None
+    path = urlparse(url).path.strip('/')
+    if path.startswith('in/'):
+        return path.split('/')[1]
+    return None
+
+
+def make_urls(rows, people, seed=0):
+    # Returns the URLs and how many different people they belong to
+    rng = random.Random(seed)
+    urls = []
+    indices = set()
+    for _ in range(rows):
+        i = rng.randrange(people)
+        indices.add(i)
+        # Every tenth person has a non-ASCII vanity name, which LinkedIn percent-encodes
+        slug = f"jérôme-person-{i}" if i % 10 == 0 else f"person-{i}"
+        urls.append(rng.choice(VARIANTS).format(slug=slug, i=i, upper=slug.title(), encoded=quote(slug)))
+    return pd.Series(urls), len(indices)
+
+
+def timed(func):
+    start = time.perf_counter()
+    result = func()
+    return result, time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=200_000)
+    parser.add_argument("--people", type=int, default=50_000)
+    args = parser.parse_args()
+
+    urls, people = make_urls(args.rows, args.people)
+    # About what one run checks against the ledger
+    candidates = list(urls.sample(min(1000, args.rows), random_state=0))
+
+    legacy, legacy_time = timed(lambda: urls.apply(legacy_profile_id))
+    ledger._canonical_profile_id.cache_clear()
+    scalar, scalar_time = timed(lambda: urls.apply(ledger.get_profile_id))
+    vectorized, vectorized_time = timed(lambda: ledger.get_profile_ids(urls))
+    assert scalar.tolist() == vectorized.tolist()
+
+    # New URLs during a run go through the LRU-cached scalar version
+    ledger._canonical_profile_id.cache_clear()
+    _, cold_time = timed(lambda: [ledger.get_profile_id(url) for url in candidates])
+    _, warm_time = timed(lambda: [ledger.get_profile_id(url) for url in candidates])
+
+    print(f"ledger rows: {args.rows}, {people} people behind {urls.nunique()} distinct URLs")
+    print(f"legacy urlparse .apply:  {legacy_time:.3f}s, {legacy.nunique()} distinct recipients")
+    print(f"canonical scalar .apply: {scalar_time:.3f}s, {scalar.nunique()} distinct recipients")
+    print(f"vectorized get_profile_ids: {vectorized_time:.3f}s "
+          f"({legacy_time / vectorized_time:.1f}x faster than legacy)")
+    print(f"scalar lookups for {len(candidates)} URLs: {cold_time / len(candidates) * 1e6:.2f} us cold, "
+          f"{warm_time / len(candidates) * 1e6:.2f} us cached")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+"""Duplicate-check benchmark: per-candidate DataFrame scan vs. the recipient index.
+
+Run with: python benchmarks/bench_recipient_index.py [--rows 100000] [--candidates 20]
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import ledger  # noqa: E402
+
+
+def make_ledger(path, rows):
+    start = datetime.now() - timedelta(days=rows // 10)
+    df = pd.DataFrame({
+        "Email": ["bench@example.com"] * rows,
+        "ProfileURL": [f"https://www.linkedin.com/in/person-{i}/" for i in range(rows)],
+        "Name": [f"Person {i}" for i in range(rows)],
+        "Title": ["Engineer"] * rows,
+        "Date": [start + timedelta(minutes=i) for i in range(rows)],
+        "Message": ["Hello!"] * rows,
+    })
+    ledger.save_sent_messages(df, path)
+
+
+def legacy_is_duplicate(df, profile_url):
+    # The pre-index implementation, kept here as the baseline
+    profile_id = ledger.get_profile_id(profile_url)
+    if not profile_id:
+        return False
+    existing_ids = df['ProfileURL'].apply(ledger.get_profile_id)
+    return profile_id in existing_ids.values
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=100_000)
+    parser.add_argument("--candidates", type=int, default=20)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "bench.db")
+        make_ledger(path, args.rows)
+        # Half of the candidates are already in the ledger
+        candidates = [f"https://www.linkedin.com/in/person-{i}/" if i % 2 == 0
+                      else f"https://www.linkedin.com/in/new-person-{i}/"
+                      for i in range(args.candidates)]
+
+        df = ledger.load_sent_messages(path)
+        start = time.perf_counter()
+        legacy_hits = sum(legacy_is_duplicate(df, url) for url in candidates)
+        legacy_time = time.perf_counter() - start
+
+        start = time.perf_counter()
+        recipient_ids = ledger.load_recipient_ids(path)
+        build_time = time.perf_counter() - start
+        start = time.perf_counter()
+        index_hits = sum(ledger.is_duplicate_recipient(recipient_ids, url) for url in candidates)
+        lookup_time = time.perf_counter() - start
+
+    assert legacy_hits == index_hits
+    print(f"ledger rows: {args.rows}, candidates: {args.candidates}, duplicates: {index_hits}")
+    print(f"legacy DataFrame scan: {legacy_time:.3f}s total, "
+          f"{legacy_time / args.candidates * 1000:.2f} ms/check")
+    print(f"recipient index:       {build_time:.3f}s build, "
+          f"{lookup_time / args.candidates * 1e6:.2f} us/check")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,97 @@
+"""Startup cost of the Streamlit app and the headless CLI: import time and peak memory.
+
+Each entry point runs in fresh interpreters, so nothing is cached between samples:
+
+    app     the imports at the top of appV2.0.py plus Streamlit's server bootstrap
+    cli     `python cli.py status` from start to exit (imports included)
+    daemon  importing the scheduler and job runner, as `python cli.py daemon` does
+
+    python benchmarks/bench_startup.py [--repeat 7] [--top 8]
+"""
+import argparse
+import ast
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+ROOT_DIR = os.path.dirname(BENCH_DIR)
+APP_FILE = os.path.join(ROOT_DIR, "appV2.0.py")
+
+# Appended to every snippet: the child reports its own peak RSS (Linux) in KB
+PEAK_RSS = "\nprint(open('/proc/self/status').read().split('VmHWM:')[1].split()[0])"
+
+
+def app_imports():
+    # Only the module-level import statements, so the Streamlit UI itself isn't run
+    with open(APP_FILE, encoding="utf-8") as f:
+        source = f.read()
+    imports = [ast.get_source_segment(source, node)
+               for node in ast.parse(source).body if isinstance(node, (ast.Import, ast.ImportFrom))]
+    return "\n".join(["import streamlit.web.bootstrap"] + imports)
+
+
+def entry_points():
+    return {
+        'baseline': "pass",
+        'app': app_imports(),
+        'cli': "import cli\ncli.main(['status'])",
+        'daemon': "import scheduler, jobs",
+    }
+
+
+def run_child(code, data_dir, importtime=False):
+    args = [sys.executable] + (["-X", "importtime"] if importtime else []) + ["-c", code + PEAK_RSS]
+    env = {**os.environ, "LINKEDIN_DATA_DIR": data_dir, "PYTHONDONTWRITEBYTECODE": "1"}
+    return subprocess.run(args, cwd=ROOT_DIR, env=env, capture_output=True, text=True, check=True)
+
+
+def measure(code, data_dir, repeat):
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = run_child(code, data_dir)
+        timings.append(time.perf_counter() - start)
+    peak_kb = int(result.stdout.strip().splitlines()[-1])
+    return {'median': statistics.median(timings), 'min': min(timings), 'peak_rss_mb': peak_kb / 1024}
+
+
+def slowest_imports(code, data_dir, top):
+    # Top-level packages by cumulative import time, from -X importtime
+    totals = {}
+    for line in run_child(code, data_dir, importtime=True).stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line or "cumulative" in line:
+            continue
+        _, cumulative, name = line.split("|")
+        if name.startswith(" ") and not name.startswith("  "):
+            package = name.strip().split(".")[0]
+            totals[package] = totals.get(package, 0) + int(cumulative)
+    return sorted(totals.items(), key=lambda item: item[1], reverse=True)[:top]
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--repeat", type=int, default=7)
+    parser.add_argument("--top", type=int, default=8, help="slowest imports to list per entry point")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as data_dir:
+        points = entry_points()
+        results = {name: measure(code, data_dir, args.repeat) for name, code in points.items()}
+
+        print(f"{'entry point':<12} {'median ms':>10} {'min ms':>8} {'peak RSS MB':>12}")
+        for name, result in results.items():
+            print(f"{name:<12} {result['median'] * 1000:>10.0f} {result['min'] * 1000:>8.0f} "
+                  f"{result['peak_rss_mb']:>12.1f}")
+
+        for name in ('app', 'cli', 'daemon'):
+            print(f"\nSlowest imports for {name}:")
+            for package, microseconds in slowest_imports(points[name], data_dir, args.top):
+                print(f"  {package:<24} {microseconds / 1000:>8.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,121 @@
+"""End-to-end run of appV2.0.py against the local stand-in server, with no network access.
+
+Starts benchmarks/standin_server.py, points the app at it with LINKEDIN_BASE_URL, keeps the
+ledger and browser session in a temporary LINKEDIN_DATA_DIR, clicks "Send Messages Now"
+through Streamlit's AppTest harness, waits for the background job and reports what was
+sent plus per-phase timings taken from the server's request log. Needs a local Chrome/Chromium and chromedriver.
+
+    python benchmarks/e2e_standin.py [--results 60] [--latency 0.2] [--max-messages 5] [--runs 2]
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+ROOT_DIR = os.path.dirname(BENCH_DIR)
+sys.path.insert(0, ROOT_DIR)
+sys.path.insert(0, BENCH_DIR)
+
+from standin_server import start_server  # noqa: E402
+
+APP_FILE = os.path.join(ROOT_DIR, "appV2.0.py")
+
+
+def phase_of(request):
+    path = request['path']
+    if path in ("/login", "/feed/"):
+        return "login"
+    if path.startswith("/search/results/"):
+        return "search"
+    if path == "/search/api/cards":
+        return "scroll"
+    if path == "/api/messages" and request['method'] == "POST":
+        return "messages"
+    return None
+
+
+def phase_timings(requests, run_start, run_end):
+    # A phase runs from its first request until the next phase's first request (or the run's end)
+    starts = {}
+    for request in sorted(requests, key=lambda r: r['start']):
+        phase = phase_of(request)
+        if phase and phase not in starts:
+            starts[phase] = request['start']
+    ordered = sorted(starts.items(), key=lambda item: item[1])
+    timings = {'startup': (ordered[0][1] if ordered else run_end) - run_start}
+    for (phase, start), following in zip(ordered, ordered[1:] + [(None, run_end)]):
+        timings[phase] = following[1] - start
+    return timings
+
+
+def run_app(base_url, email, title, message, max_messages, delay):
+    from streamlit.testing.v1 import AppTest
+
+    at = AppTest.from_file(APP_FILE, default_timeout=600)
+    at.run()
+    at.sidebar.number_input[0].set_value(max_messages)
+    at.sidebar.number_input[1].set_value(delay)
+    at.text_input[0].input(email)
+    at.text_input[1].input("stand-in-password")
+    at.text_input[2].input(title)
+    at.text_area[0].input(message)
+    next(button for button in at.button if button.label == "Send Messages Now").click()
+    at.run()
+    # The click only queues the run; wait for the background worker, then render its events
+    from jobs import get_runner
+    job = get_runner().get(at.session_state.job_id)
+    while not job.finished:
+        time.sleep(0.2)
+    at.run()
+    return at
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--results", type=int, default=60)
+    parser.add_argument("--latency", type=float, default=0.2)
+    parser.add_argument("--max-messages", type=int, default=5)
+    parser.add_argument("--delay", type=int, default=1, help="pacing delay between messages")
+    parser.add_argument("--runs", type=int, default=2, help="later runs exercise session reuse and dedup")
+    args = parser.parse_args()
+
+    server, base_url = start_server(results=args.results, latency=args.latency)
+    data_dir = tempfile.mkdtemp(prefix="linkedin-e2e-")
+    os.environ["LINKEDIN_BASE_URL"] = base_url
+    os.environ["LINKEDIN_DATA_DIR"] = data_dir
+    print(f"Stand-in at {base_url}, data in {data_dir}")
+    # Imported only now so that the app modules pick up LINKEDIN_DATA_DIR
+    from metrics import METRICS_JSONL_FILE, load_recent_runs
+
+    messaged = set()
+    try:
+        for run in range(1, args.runs + 1):
+            server.state.reset()
+            run_start = time.time()
+            # Each run raises the daily limit so it has to skip the previous runs' recipients
+            at = run_app(base_url, "e2e@example.com", "Data Scientist", "Hello from the stand-in!",
+                         args.max_messages * run, args.delay)
+            run_end = time.time()
+
+            for element in at.error:
+                print(f"  error: {element.value}")
+            recipients = [m['recipient'] for m in server.state.messages]
+            print(f"\nRun {run}: {len(recipients)} messages sent in {run_end - run_start:.1f}s")
+            for phase, seconds in phase_timings(server.state.requests, run_start, run_end).items():
+                print(f"  {phase:<10} {seconds:>7.2f}s")
+            recent_runs = load_recent_runs(1, METRICS_JSONL_FILE)
+            if recent_runs:
+                print("  app spans:")
+                for name, timing in recent_runs[-1]['spans'].items():
+                    print(f"    {name:<22} {timing['total']:>7.2f}s over {timing['count']}")
+            assert len(recipients) == len(set(recipients)) and not messaged & set(recipients), \
+                "a recipient was messaged twice"
+            messaged.update(recipients)
+    finally:
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,120 @@
+// Client-side behaviour of the stand-in LinkedIn pages served by benchmarks/standin_server.py
+(function () {
+  const params = new URLSearchParams(location.search);
+  const searchInput = document.querySelector("input[aria-label='Search']");
+  const searchButton = document.querySelector("button[aria-label='Click to start a search']");
+
+  if (searchButton) {
+    searchButton.addEventListener("click", () => searchInput.focus());
+  }
+  if (searchInput) {
+    searchInput.addEventListener("keydown", (event) => {
+      if (event.key === "Enter") {
+        location.href = "/search/results/all/?keywords=" + encodeURIComponent(searchInput.value);
+      }
+    });
+  }
+
+  // Infinite scroll: fetch the next page of result cards when the bottom is reached
+  const list = document.querySelector(".search-results-container ul");
+  let loading = false;
+  let exhausted = false;
+
+  function fetchCards(start) {
+    return fetch("/search/api/cards?keywords=" +
+      encodeURIComponent(params.get("keywords") || "") + "&start=" + start).then((response) => response.text());
+  }
+
+  async function loadMoreResults() {
+    if (!list || loading || exhausted) return;
+    loading = true;
+    const html = await fetchCards(list.children.length);
+    if (html.trim()) {
+      list.insertAdjacentHTML("beforeend", html);
+    } else {
+      exhausted = true;
+    }
+    loading = false;
+  }
+
+  // Applying a filter replaces the whole result list (after the usual page latency), like
+  // LinkedIn does, so the cards from before the click go stale
+  async function refreshResults() {
+    if (!list) return;
+    loading = true;
+    list.innerHTML = await fetchCards(0);
+    exhausted = false;
+    loading = false;
+  }
+
+  document.querySelectorAll(".search-reusables__filters-bar button").forEach((button) => {
+    button.addEventListener("click", () => {
+      button.setAttribute("aria-pressed", "true");
+      refreshResults();
+    });
+  });
+
+  window.addEventListener("scroll", () => {
+    if (window.innerHeight + window.scrollY >= document.body.scrollHeight - 200) {
+      loadMoreResults();
+    }
+  });
+
+  // Messaging overlay
+  const overlayContainer = document.querySelector(".msg-overlay-container");
+
+  function openConversation(card) {
+    const link = card.querySelector("a[data-test-app-aware-link]");
+    const name = card.querySelector("a[data-test-app-aware-link] span[aria-hidden='true']").textContent.trim();
+    const recipient = link.getAttribute("href").split("?")[0];
+    overlayContainer.innerHTML = `
+      <div class="msg-overlay-conversation-bubble" data-recipient="${recipient}">
+        <header class="msg-overlay-bubble-header">
+          <h2 class="msg-overlay-bubble-header__title">${name}</h2>
+          <button class="msg-overlay-bubble-header__control artdeco-button artdeco-button--circle" type="button">
+            <svg data-test-icon="close-small" width="16" height="16"></svg>
+          </button>
+        </header>
+        <form class="msg-form">
+          <div class="msg-form__msg-content-container msg-form__message-texteditor">
+            <div class="msg-form__contenteditable" contenteditable="true" role="textbox"><p><br></p></div>
+          </div>
+          <p class="msg-form__hint">Press Enter to send</p>
+          <p class="msg-form__attachments">Attach an image, file or GIF</p>
+          <p class="msg-form__counter">0/8000</p>
+          <footer class="msg-form__footer">
+            <p class="msg-form__legal">Messages are subject to the User Agreement</p>
+            <button type="submit" class="msg-form__send-button artdeco-button artdeco-button--1">Send</button>
+          </footer>
+        </form>
+      </div>`;
+  }
+
+  document.addEventListener("click", (event) => {
+    const button = event.target.closest("button");
+    if (!button) return;
+    // A result card in search, or the top card on a profile page
+    const card = button.closest("li, .pv-top-card");
+    if (button.textContent.trim() === "Message" && card) {
+      openConversation(card);
+    } else if (button.classList.contains("msg-overlay-bubble-header__control")) {
+      button.closest(".msg-overlay-conversation-bubble").remove();
+    }
+  });
+
+  document.addEventListener("submit", async (event) => {
+    const form = event.target.closest(".msg-form");
+    if (!form) return;
+    event.preventDefault();
+    const bubble = form.closest(".msg-overlay-conversation-bubble");
+    await fetch("/api/messages", {
+      method: "POST",
+      headers: {"Content-Type": "application/json"},
+      body: JSON.stringify({
+        recipient: bubble.dataset.recipient,
+        text: form.querySelector(".msg-form__contenteditable").innerText.trim(),
+      }),
+    });
+    form.querySelector(".msg-form__contenteditable").innerHTML = "<p><br></p>";
+  });
+})();
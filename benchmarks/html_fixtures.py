@@ -0,0 +1,57 @@
+"""Builds people-search result pages of any size from the saved templates in fixtures/."""
+import os
+import random
+
+FIXTURES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures")
+
+FIRST_NAMES = ["Amira", "Omar", "Sara", "Youssef", "Lina", "Karim", "Nour", "Hassan", "Maya", "Ziad"]
+LAST_NAMES = ["Hassan", "Mostafa", "Ibrahim", "Saleh", "Farouk", "Nabil", "Adel", "Khalil", "Samir", "Fathy"]
+HEADLINES = ["Data Scientist", "Software Engineer", "Product Manager", "ML Engineer", "Data Analyst"]
+LOCATIONS = ["Cairo, Egypt", "Alexandria, Egypt", "Dubai, United Arab Emirates", "Berlin, Germany"]
+
+
+def read_fixture(name):
+    with open(os.path.join(FIXTURES_DIR, name), encoding="utf-8") as f:
+        return f.read()
+
+
+def fill_template(template, **values):
+    # str.format would trip over the braces in inline CSS and JS
+    for key, value in values.items():
+        template = template.replace("{" + key + "}", str(value))
+    return template
+
+
+def profile_record(index, seed=0):
+    rng = random.Random(seed * 1_000_003 + index)
+    name = f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}"
+    return {
+        'name': name,
+        'url': f"https://www.linkedin.com/in/{name.lower().replace(' ', '-')}-{index}",
+        'headline': rng.choice(HEADLINES),
+        'location': rng.choice(LOCATIONS),
+    }
+
+
+def render_cards(start, count, seed=0):
+    card = read_fixture("result_card.html")
+    cards = []
+    for index in range(start, start + count):
+        record = profile_record(index, seed)
+        cards.append(fill_template(card, index=index, slug=record['url'].rsplit('/', 1)[1],
+                                   name=record['name'], headline=record['headline'],
+                                   location=record['location']))
+    return "\n".join(cards)
+
+
+def render_search_page(count, seed=0):
+    # Pad the page with the kind of inline payloads LinkedIn ships so parsing is not results-only
+    filler = "".join(f".c{i}{{margin:{i % 7}px;padding:{i % 5}px}}" for i in range(2000))
+    bootstrap = '{"data":[' + ",".join(f'{{"urn":"urn:li:fs:{i}","v":{i}}}' for i in range(count * 20)) + ']}'
+    script = "".join(f"window.__m{i}=function(a){{return a+{i}}};" for i in range(500))
+    return fill_template(read_fixture("search_page.html"), styles=filler, bootstrap=bootstrap,
+                         script=script, overlay="", cards=render_cards(0, count, seed))
+
+
+def expected_profiles(count, seed=0):
+    return [profile_record(index, seed) for index in range(count)]
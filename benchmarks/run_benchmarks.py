@@ -0,0 +1,180 @@
+"""Offline benchmark suite for the parsing and ledger paths.
+
+Times extract_profiles_from_html on fixture pages of increasing size, and the ledger
+operations behind load_sent_messages, save_sent_messages, get_profile_ids, is_duplicate_recipient,
+check_daily_limit and the history panel on synthetic ledgers, plus the per-send journal.
+Results are written as JSON so two commits can be compared:
+
+    python benchmarks/run_benchmarks.py                      # writes benchmarks/results/<commit>.json
+    python benchmarks/run_benchmarks.py --quick              # smaller sizes, for a fast sanity run
+    python benchmarks/run_benchmarks.py --compare benchmarks/results/<old commit>.json
+"""
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import journal  # noqa: E402
+import ledger  # noqa: E402
+import parsing  # noqa: E402
+from bench_recipient_index import make_ledger  # noqa: E402
+from html_fixtures import render_search_page  # noqa: E402
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+RESULTS_DIR = os.path.join(BENCH_DIR, "results")
+PAGE_SIZES = [10, 100, 500, 1000]
+LEDGER_SIZES = [1_000, 10_000, 100_000]
+QUICK_PAGE_SIZES = [10, 100]
+QUICK_LEDGER_SIZES = [1_000, 10_000]
+REGRESSION_THRESHOLD = 1.2  # flag anything 20% slower than the baseline
+
+
+def time_call(func, repeat):
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+    return {'min': min(timings), 'median': statistics.median(timings), 'repeat': repeat}
+
+
+def bench_parsing(sizes, repeat):
+    results = {}
+    for size in sizes:
+        html = render_search_page(size)
+        results[f"extract_profiles_from_html[{size}]"] = time_call(
+            lambda: parsing.extract_profiles_from_html(html), repeat)
+    return results
+
+
+def bench_ledger(sizes, repeat):
+    results = {}
+    candidates = [f"https://www.linkedin.com/in/person-{i}/" for i in range(0, 200, 2)] + \
+                 [f"https://www.linkedin.com/in/new-person-{i}/" for i in range(100)]
+    with tempfile.TemporaryDirectory() as tmp:
+        for size in sizes:
+            path = os.path.join(tmp, f"ledger_{size}.db")
+            make_ledger(path, size)
+            df = ledger.load_sent_messages(path)
+
+            results[f"load_sent_messages[{size}]"] = time_call(
+                lambda: ledger.load_sent_messages(path), repeat)
+            results[f"save_sent_messages[{size}]"] = time_call(
+                lambda: ledger.save_sent_messages(df, path), repeat)
+            results[f"record_sent_message[{size}]"] = time_call(
+                lambda: ledger.record_sent_message("bench@example.com", "https://www.linkedin.com/in/extra/",
+                                                   "Extra", "Engineer", "Hello!", path=path), repeat)
+            results[f"get_profile_ids[{size}]"] = time_call(
+                lambda: ledger.get_profile_ids(df['ProfileURL']), repeat)
+            results[f"load_recipient_ids[{size}]"] = time_call(
+                lambda: ledger.load_recipient_ids(path), repeat)
+            recipient_ids = ledger.load_recipient_ids(path)
+            results[f"is_duplicate_recipient[{size}]x{len(candidates)}"] = time_call(
+                lambda: [ledger.is_duplicate_recipient(recipient_ids, url) for url in candidates], repeat)
+            results[f"check_daily_limit[{size}]"] = time_call(
+                lambda: ledger.daily_limit_reached(10, path=path), repeat)
+            # History panel: the old full load plus nunique, against an uncached summary and last page
+            results[f"history_full_load[{size}]"] = time_call(
+                lambda: ledger.load_sent_messages(path)['ProfileURL'].nunique(), repeat)
+            results[f"history_summary[{size}]"] = time_call(
+                lambda: ledger.history_summary(path), repeat)
+            results[f"query_sent_messages_last_page[{size}]"] = time_call(
+                lambda: ledger.query_sent_messages(limit=100, offset=max(0, size - 100), path=path), repeat)
+    return results
+
+
+def bench_journal(sizes, repeat):
+    # Per-message durability cost: fsynced journal entry plus ledger row, against the old
+    # full-workbook rewrite after every send (skipped above 10k rows, where it takes seconds)
+    results = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        journal_path = os.path.join(tmp, "send_journal.jsonl")
+        results["journal_send"] = time_call(
+            lambda: journal.journal_recorded(journal.journal_send(
+                "bench@example.com", "https://www.linkedin.com/in/extra/", "Extra", "Engineer", "Hello!",
+                path=journal_path), journal_path), repeat)
+        for size in sizes:
+            if size > 10_000:
+                continue
+            path = os.path.join(tmp, f"ledger_{size}.db")
+            make_ledger(path, size)
+            df = ledger.load_sent_messages(path)
+            excel_path = os.path.join(tmp, f"ledger_{size}.xlsx")
+            results[f"excel_rewrite[{size}]"] = time_call(
+                lambda: df.to_excel(excel_path, index=False, engine='openpyxl'), min(repeat, 3))
+    return results
+
+
+def git_commit():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=BENCH_DIR,
+                              capture_output=True, text=True, check=True).stdout.strip()
+    except Exception:
+        return "unknown"
+
+
+def compare(current, baseline_path):
+    with open(baseline_path, encoding="utf-8") as f:
+        baseline = json.load(f)
+    print(f"\nCompared with {baseline['commit']} ({baseline['timestamp']}):")
+    regressions = 0
+    for name, result in current['results'].items():
+        old = baseline['results'].get(name)
+        if not old:
+            continue
+        ratio = result['min'] / old['min'] if old['min'] else float("inf")
+        flag = "  REGRESSION" if ratio > REGRESSION_THRESHOLD else ""
+        regressions += bool(flag)
+        print(f"  {name:<45} {old['min'] * 1000:>10.2f} ms -> {result['min'] * 1000:>10.2f} ms "
+              f"({ratio:.2f}x){flag}")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--quick", action="store_true", help="only the small fixture and ledger sizes")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--output", help="JSON results path (default: benchmarks/results/<commit>.json)")
+    parser.add_argument("--compare", help="earlier results JSON to compare against")
+    args = parser.parse_args()
+
+    page_sizes = QUICK_PAGE_SIZES if args.quick else PAGE_SIZES
+    ledger_sizes = QUICK_LEDGER_SIZES if args.quick else LEDGER_SIZES
+
+    results = {}
+    results.update(bench_parsing(page_sizes, args.repeat))
+    results.update(bench_ledger(ledger_sizes, args.repeat))
+    results.update(bench_journal(ledger_sizes, args.repeat))
+
+    commit = git_commit()
+    report = {
+        'commit': commit,
+        'timestamp': datetime.now().isoformat(timespec="seconds"),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'results': results,
+    }
+    for name, result in results.items():
+        print(f"{name:<45} min {result['min'] * 1000:>10.2f} ms   median {result['median'] * 1000:>10.2f} ms")
+
+    output = args.output or os.path.join(RESULTS_DIR, f"{commit}.json")
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2)
+    print(f"\nResults written to {output}")
+
+    if args.compare and compare(report, args.compare):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,174 @@
+"""Local stand-in for the parts of LinkedIn that search_and_send_messages drives.
+
+Serves the login form, the feed with the global search bar, a people-results page that
+loads more cards on scroll, profile pages and the msg-form overlay, using the same ids,
+classes and labels the automation selects on. Sent messages and a timed request log are kept in
+memory and exposed as JSON, so a run can be checked and broken down by phase.
+
+    python benchmarks/standin_server.py --port 8765 --results 60 --latency 0.2
+    LINKEDIN_BASE_URL=http://127.0.0.1:8765 streamlit run appV2.0.py
+
+benchmarks/e2e_standin.py does both and drives the Streamlit app headlessly.
+"""
+import argparse
+import json
+import os
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from html_fixtures import fill_template, profile_record, read_fixture, render_cards  # noqa: E402
+
+SESSION_COOKIE = "li_at"
+PAGE_SIZE = 10
+
+
+class StandinState:
+    def __init__(self, results, latency, page_size=PAGE_SIZE):
+        self.results = results
+        self.latency = latency
+        self.page_size = page_size
+        self.messages = []
+        self.requests = []
+        self.lock = threading.Lock()
+
+    def log_request(self, method, path, started, finished, status):
+        with self.lock:
+            self.requests.append({'method': method, 'path': path, 'status': status,
+                                  'start': started, 'seconds': finished - started})
+
+    def record_message(self, recipient, text):
+        with self.lock:
+            self.messages.append({'recipient': recipient, 'text': text, 'time': time.time()})
+
+    def reset(self):
+        with self.lock:
+            self.messages.clear()
+            self.requests.clear()
+
+
+class StandinHandler(BaseHTTPRequestHandler):
+    server_version = "LinkedInStandin/1.0"
+
+    @property
+    def state(self):
+        return self.server.state
+
+    def log_message(self, format, *args):
+        pass  # the request log is kept in StandinState instead of stderr
+
+    def _logged_in(self):
+        return f"{SESSION_COOKIE}=" in self.headers.get("Cookie", "")
+
+    def _send(self, status, body="", content_type="text/html; charset=utf-8", headers=None):
+        payload = body.encode("utf-8") if isinstance(body, str) else body
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(payload)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(payload)
+        return status
+
+    def _redirect(self, location, headers=None):
+        return self._send(303, "", headers={"Location": location, **(headers or {})})
+
+    def _page(self, template, **values):
+        return fill_template(read_fixture(template), styles=read_fixture("standin.css"),
+                             script=read_fixture("standin.js"), **values)
+
+    def _handle(self, method):
+        started = time.time()
+        url = urlparse(self.path)
+        query = parse_qs(url.query)
+        status = 500
+        try:
+            status = self._route(method, url.path, query)
+        finally:
+            self.state.log_request(method, url.path, started, time.time(), status)
+
+    def _route(self, method, path, query):
+        if path == "/login" and method == "GET":
+            return self._send(200, read_fixture("login.html"))
+        if path == "/login" and method == "POST":
+            self.rfile.read(int(self.headers.get("Content-Length", 0)))
+            return self._redirect("/feed/", {"Set-Cookie": f"{SESSION_COOKIE}=standin; Path=/; Max-Age=86400"})
+        if path.startswith("/api/"):
+            return self._route_api(method, path)
+        if not self._logged_in():
+            return self._redirect("/login")
+        if path == "/feed/":
+            return self._send(200, self._page("feed.html"))
+        if path.startswith("/search/results/"):
+            first_page = render_cards(0, min(self.state.page_size, self.state.results))
+            return self._send(200, self._page("search_page.html", bootstrap="{}", overlay="", cards=first_page))
+        if path.startswith("/in/"):
+            return self._profile(path.rstrip("/").rsplit("/", 1)[1])
+        if path == "/search/api/cards":
+            start = int(query.get("start", ["0"])[0])
+            count = max(0, min(self.state.page_size, self.state.results - start))
+            time.sleep(self.state.latency)
+            return self._send(200, render_cards(start, count) if count else "")
+        return self._send(404, "Not found", "text/plain")
+
+    def _profile(self, slug):
+        # Profile pages are only opened for candidates from a checkpoint or the search cache
+        index = slug.rsplit("-", 1)[-1]
+        if not index.isdigit() or int(index) >= self.state.results:
+            return self._send(404, "Not found", "text/plain")
+        record = profile_record(int(index))
+        return self._send(200, self._page("profile.html", slug=slug, name=record['name'],
+                                          headline=record['headline'], location=record['location']))
+
+    def _route_api(self, method, path):
+        if path == "/api/messages" and method == "POST":
+            body = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))) or b"{}")
+            self.state.record_message(body.get("recipient"), body.get("text"))
+            return self._send(201, "{}", "application/json")
+        if path == "/api/messages":
+            return self._send(200, json.dumps(self.state.messages), "application/json")
+        if path == "/api/requests":
+            return self._send(200, json.dumps(self.state.requests), "application/json")
+        return self._send(404, "Not found", "text/plain")
+
+    def do_GET(self):
+        self._handle("GET")
+
+    def do_POST(self):
+        self._handle("POST")
+
+
+def start_server(port=0, results=60, latency=0.2, page_size=PAGE_SIZE):
+    # Starts the server on a background thread; port 0 picks a free port
+    server = ThreadingHTTPServer(("127.0.0.1", port), StandinHandler)
+    server.daemon_threads = True
+    server.state = StandinState(results, latency, page_size)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    return server, f"http://127.0.0.1:{server.server_address[1]}"
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--results", type=int, default=60, help="total number of people results")
+    parser.add_argument("--page-size", type=int, default=PAGE_SIZE, help="cards loaded per scroll")
+    parser.add_argument("--latency", type=float, default=0.2, help="seconds before each scroll page loads")
+    args = parser.parse_args()
+
+    server, base_url = start_server(args.port, args.results, args.latency, args.page_size)
+    print(f"Stand-in LinkedIn running at {base_url} (LINKEDIN_BASE_URL={base_url})")
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,214 @@
+import logging
+import time
+
+from metrics import count, span
+from parsing import HEADLINE_CLASS, LOCATION_CLASS, PROFILE_LINK_CLASS, RESULT_CONTAINER_CLASS
+from sessions import site_url
+
+
+logger = logging.getLogger(__name__)
+
+# Selenium is imported inside the functions that wait on elements, so that importing this
+# module (for its selectors and scripts) stays cheap
+
+RESULT_CARD_SELECTOR = f"li.{RESULT_CONTAINER_CLASS}"
+SCROLL_PAUSE = 2  # seconds the old scroll loop slept per step; used as the baseline
+SCROLL_TIMEOUT = 2  # longest wait for new results after a scroll before treating the list as complete
+
+# Message composer inside the open msg-form overlay
+MESSAGE_CONTAINER_XPATH = "//div[starts-with(@class, 'msg-form__msg-content-container')]"
+MESSAGE_EDITOR_SELECTOR = "div[contenteditable='true'] p"
+# Relative to a message container: the Send button of the same msg-form
+MESSAGE_SEND_BUTTON_XPATH = "./ancestor::form[1]//button[@type='submit' and contains(@class, 'msg-form__send-button')]"
+# Relative to a message container: the close button in its conversation bubble's header
+MESSAGE_CLOSE_BUTTON_XPATH = ("./ancestor::div[contains(@class, 'msg-overlay-conversation-bubble')][1]"
+                              "//button[contains(@class, 'msg-overlay-bubble-header__control')]"
+                              "//*[contains(@data-test-icon, 'close-small')]/ancestor::button")
+# Message button in a profile's top card, for candidates from a checkpoint or the search cache
+PROFILE_MESSAGE_BUTTON_XPATH = "//main//button[.//span[normalize-space()='Message']]"
+
+# Reads every result card after the first `start` in one round trip. Each record carries the
+# card's own Message button, so a profile can never be paired with someone else's button.
+# Text is collected like BeautifulSoup's get_text(strip=True) to match extract_profiles_from_html.
+HARVEST_CARDS_SCRIPT = """
+const [cardSelector, linkSelector, headlineSelector, locationSelector, start] = arguments;
+const text = (element) => {
+    const walker = document.createTreeWalker(element, NodeFilter.SHOW_TEXT);
+    const parts = [];
+    while (walker.nextNode()) {
+        const part = walker.currentNode.nodeValue.trim();
+        if (part) parts.push(part);
+    }
+    return parts.join("");
+};
+const isMessageButton = (button) => Array.from(button.querySelectorAll("span")).some((span) =>
+    Array.from(span.childNodes).some((node) => node.nodeType === Node.TEXT_NODE && node.nodeValue === "Message"));
+return Array.from(document.querySelectorAll(cardSelector)).slice(start).map((card) => {
+    const link = card.querySelector(linkSelector);
+    if (!link || !link.getAttribute("href")) return null;
+    const name = link.querySelector("span[aria-hidden='true']");
+    const headline = card.querySelector(headlineSelector);
+    const location = card.querySelector(locationSelector);
+    return {
+        name: name ? text(name) : "Unknown",
+        url: link.getAttribute("href").split("?")[0],
+        headline: headline ? text(headline) : "",
+        location: location ? text(location) : "",
+        button: Array.from(card.querySelectorAll("button")).find(isMessageButton) || null,
+    };
+});
+"""
+HARVEST_SELECTORS = (
+    RESULT_CARD_SELECTOR,
+    f"a.{PROFILE_LINK_CLASS}[data-test-app-aware-link]",
+    f"div.{HEADLINE_CLASS}",
+    f"div.{LOCATION_CLASS}",
+)
+
+# Scrolls to the bottom, then resolves as soon as a DOM mutation brings the card count above
+# arguments[1], or with the unchanged count once arguments[2] milliseconds have passed
+SCROLL_AND_WAIT_SCRIPT = """
+const [selector, seen, timeoutMs, done] = arguments;
+const count = () => document.querySelectorAll(selector).length;
+window.scrollTo(0, document.body.scrollHeight);
+if (count() > seen) { done(count()); return; }
+let timer = null;
+const observer = new MutationObserver(() => {
+    if (count() > seen) { observer.disconnect(); clearTimeout(timer); done(count()); }
+});
+timer = setTimeout(() => { observer.disconnect(); done(count()); }, timeoutMs);
+observer.observe(document.body, {childList: true, subtree: true});
+"""
+
+
+def harvest_result_cards(driver, start=0):
+    """Return profile records for the result cards after the first `start`, plus the card count.
+
+    Records have the same name/url/headline/location keys as extract_profiles_from_html and a
+    'button' WebElement for the card's Message button (None when the card has none).
+    """
+    with span("harvest"):
+        records = driver.execute_script(HARVEST_CARDS_SCRIPT, *HARVEST_SELECTORS, start)
+    count("harvested_cards", len(records))
+    return [record for record in records if record], start + len(records)
+
+
+def scroll_for_more_results(driver, seen, timeout=SCROLL_TIMEOUT):
+    # Returns the number of result cards on the page once new ones arrived or the timeout expired
+    return driver.execute_async_script(SCROLL_AND_WAIT_SCRIPT, RESULT_CARD_SELECTOR, seen, int(timeout * 1000))
+
+
+def stream_result_profiles(driver, timeout=SCROLL_TIMEOUT, scroll_stats=None):
+    """Yield search result profiles (see harvest_result_cards) as the infinite scroll loads them.
+
+    Scrolling only continues while the caller keeps asking for profiles, so breaking out
+    of the loop stops the scroll without loading or serializing the rest of the page.
+    Each scroll waits for the result count to grow instead of sleeping a fixed time; the
+    optional scroll_stats dict is filled with the step count, time spent waiting and the
+    time saved against the old fixed SCROLL_PAUSE per step.
+    """
+    stats = scroll_stats if scroll_stats is not None else {}
+    stats.update({'steps': 0, 'waited': 0.0, 'saved': 0.0})
+    driver.set_script_timeout(timeout + 10)
+
+    seen = 0
+    while True:
+        profiles, seen = harvest_result_cards(driver, seen)
+        yield from profiles
+
+        start = time.perf_counter()
+        card_count = scroll_for_more_results(driver, seen, timeout)
+        waited = time.perf_counter() - start
+        stats['steps'] += 1
+        stats['waited'] += waited
+        stats['saved'] += max(0.0, SCROLL_PAUSE - waited)
+        if card_count <= seen:
+            logger.info(f"Reached the end of the search results after {seen} cards "
+                        f"({stats['steps']} scrolls, {stats['saved']:.1f}s saved vs fixed sleeps)")
+            return
+
+
+def open_profile_message(driver, profile_url, timeout=20):
+    # Opens the msg-form overlay from the person's profile page instead of a search result card
+    from selenium.webdriver.common.by import By
+    from selenium.webdriver.support import expected_conditions as EC
+    from selenium.webdriver.support.ui import WebDriverWait
+
+    driver.get(site_url(profile_url))
+    button = WebDriverWait(driver, timeout).until(
+        EC.element_to_be_clickable((By.XPATH, PROFILE_MESSAGE_BUTTON_XPATH)))
+    driver.execute_script("arguments[0].click();", button)
+
+
+def new_message_container(existing):
+    # Wait condition: the newest msg-form container that is not one of `existing` (the ones open
+    # before the click), so a bubble that never closed can't be mistaken for the new conversation
+    from selenium.webdriver.common.by import By
+
+    def _predicate(driver):
+        opened = [container for container in driver.find_elements(By.XPATH, MESSAGE_CONTAINER_XPATH)
+                  if container not in existing]
+        return opened[-1] if opened else False
+
+    return _predicate
+
+
+def find_message_editor(driver, container=None, timeout=10):
+    from selenium.webdriver.common.by import By
+    from selenium.webdriver.support import expected_conditions as EC
+    from selenium.webdriver.support.ui import WebDriverWait
+
+    # One lookup scoped to the msg-form overlay instead of fetching every <p> on the page. Without
+    # a container, the newest overlay (the last in the document, as paragraphs[-5] used to pick)
+    if container is None:
+        container = WebDriverWait(driver, timeout).until(
+            EC.presence_of_all_elements_located((By.XPATH, MESSAGE_CONTAINER_XPATH)))[-1]
+    container.click()
+    return container.find_element(By.CSS_SELECTOR, MESSAGE_EDITOR_SELECTOR)
+
+
+def find_send_button(container, timeout=20):
+    from selenium.webdriver.common.by import By
+    from selenium.webdriver.support import expected_conditions as EC
+    from selenium.webdriver.support.ui import WebDriverWait
+
+    # The Send button of the overlay the message was typed into, not the first one on the page
+    return WebDriverWait(container, timeout).until(
+        EC.element_to_be_clickable((By.XPATH, MESSAGE_SEND_BUTTON_XPATH)))
+
+
+def close_message_overlay(driver, container, timeout=10):
+    """Close the conversation bubble holding `container` and wait for it to go away.
+
+    Returns False if the bubble is still open after `timeout` seconds.
+    """
+    from selenium.common.exceptions import TimeoutException
+    from selenium.webdriver.common.by import By
+    from selenium.webdriver.support import expected_conditions as EC
+    from selenium.webdriver.support.ui import WebDriverWait
+
+    close_button = WebDriverWait(container, timeout).until(
+        EC.element_to_be_clickable((By.XPATH, MESSAGE_CLOSE_BUTTON_XPATH)))
+    driver.execute_script("arguments[0].click();", close_button)
+    try:
+        # Net new wait (the old loop didn't wait here), so it isn't in the savings report
+        wait_for(driver, EC.invisibility_of_element(container), timeout=timeout)
+        return True
+    except TimeoutException:
+        return False
+
+
+def wait_for(driver, condition, replaces=None, timeout=10):
+    """WebDriverWait(driver, timeout).until(condition), recording time saved against a fixed sleep.
+
+    `replaces` is the fixed sleep (in seconds) this wait stands in for; the difference is added
+    to the run's 'sleep_seconds_saved' counter. Waits that replace no sleep (None) are left out.
+    """
+    from selenium.webdriver.support.ui import WebDriverWait
+
+    start = time.perf_counter()
+    try:
+        return WebDriverWait(driver, timeout).until(condition)
+    finally:
+        if replaces is not None:
+            count("sleep_seconds_saved", replaces - (time.perf_counter() - start))
@@ -0,0 +1,72 @@
+import hashlib
+import json
+import logging
+import os
+from datetime import datetime
+
+from paths import BASE_DIR
+
+
+logger = logging.getLogger(__name__)
+
+# Constants
+CHECKPOINTS_DIR = os.path.join(BASE_DIR, ".checkpoints")
+CANDIDATE_FIELDS = ('name', 'url', 'headline', 'location')  # everything but the live button element
+
+
+def checkpoint_path(email, title):
+    # One checkpoint per account and search title
+    key = hashlib.sha256(f"{email.strip().lower()}\n{title.strip().lower()}".encode("utf-8")).hexdigest()[:16]
+    return os.path.join(CHECKPOINTS_DIR, f"{key}.json")
+
+
+def save_checkpoint(email, title, candidates, position=0):
+    """Persist a run's candidate list and the index of the next candidate to message.
+
+    Written atomically after the search and before every candidate, so an interrupted run
+    can be resumed without searching and scrolling again.
+    """
+    try:
+        os.makedirs(CHECKPOINTS_DIR, mode=0o700, exist_ok=True)
+        path = checkpoint_path(email, title)
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump({
+                'title': title,
+                'saved_at': datetime.now().isoformat(timespec="seconds"),
+                'position': position,
+                'candidates': [{field: candidate.get(field) for field in CANDIDATE_FIELDS}
+                               for candidate in candidates],
+            }, f)
+        os.replace(tmp_path, path)
+        return True
+    except Exception as e:
+        logger.error(f"Error saving run checkpoint: {str(e)}")
+        return False
+
+
+def load_checkpoint(email, title):
+    try:
+        path = checkpoint_path(email, title)
+        if os.path.exists(path):
+            with open(path, encoding="utf-8") as f:
+                return json.load(f)
+    except Exception as e:
+        logger.warning(f"Ignoring unreadable run checkpoint: {str(e)}")
+    return None
+
+
+def remaining_candidates(email, title):
+    # Candidates the checkpointed run had not reached yet (empty when there is nothing to resume)
+    checkpoint = load_checkpoint(email, title)
+    if not checkpoint:
+        return []
+    return checkpoint['candidates'][checkpoint['position']:]
+
+
+def clear_checkpoint(email, title):
+    path = checkpoint_path(email, title)
+    if os.path.exists(path):
+        os.remove(path)
+        return True
+    return False
@@ -0,0 +1,135 @@
+"""Headless entry point: run a campaign, check today's quota, or run the scheduler daemon.
+
+    python cli.py run campaign.json      # one run now, no Streamlit
+    python cli.py run --resume campaign.json  # continue an interrupted run without searching again
+    python cli.py status [--max-messages 10]
+    python cli.py daemon                 # fire the saved schedules (same as scheduler.py)
+    python cli.py migrate [--excel sent_messages.xlsx]  # upgrade the ledger, importing the old workbook
+
+A campaign file is a JSON object with the search_and_send_messages arguments:
+
+    {"title": "Data Scientist", "message": "Hi!", "email": "me@example.com",
+     "max_messages": 10, "delay_between_messages": 10, "allowed_resources": [],
+     "search_cache_hours": 72}
+
+The password may be given as "password" or in LINKEDIN_PASSWORD; it is only needed when
+the saved browser session has expired. Sessions are only saved (encrypted) between runs when
+LINKEDIN_SESSION_KEY is set. Only the standard library is imported until a
+command needs more, and Selenium only once a browser is actually launched.
+"""
+import argparse
+import json
+import logging
+import os
+import sys
+import threading
+
+
+logger = logging.getLogger(__name__)
+
+# Constants
+CAMPAIGN_KEYS = ('title', 'message', 'email', 'password', 'max_messages', 'delay_between_messages',
+                 'manual_captcha', 'allowed_resources', 'search_cache_hours')
+REQUIRED_KEYS = ('title', 'message', 'email')
+POLL_SECONDS = 0.5
+
+
+def load_campaign(path):
+    with open(path, encoding="utf-8") as f:
+        campaign = json.load(f)
+    unknown = set(campaign) - set(CAMPAIGN_KEYS)
+    if unknown:
+        raise ValueError(f"Unknown campaign settings: {', '.join(sorted(unknown))}")
+    missing = [key for key in REQUIRED_KEYS if not campaign.get(key)]
+    if missing:
+        raise ValueError(f"Missing campaign settings: {', '.join(missing)}")
+    campaign.setdefault('password', os.environ.get("LINKEDIN_PASSWORD", ""))
+    campaign.setdefault('manual_captcha', sys.stdin.isatty())
+    campaign['allowed_resources'] = tuple(campaign.get('allowed_resources', ()))
+    return campaign
+
+
+def run_campaign(path, resume=False):
+    from automation import search_and_send_messages
+    from jobs import Job
+
+    campaign = load_campaign(path)
+    campaign['resume'] = resume
+    title, message, email, password = (campaign.pop(key) for key in ('title', 'message', 'email', 'password'))
+    job = Job(search_and_send_messages, (title, message, email, password), campaign, label=f"Campaign: {title}")
+    worker = threading.Thread(target=job.run, name="campaign", daemon=True)
+    worker.start()
+    # Messages are logged by the job; this loop only answers its prompts from the terminal
+    try:
+        while worker.is_alive():
+            worker.join(POLL_SECONDS)
+            job.poll()
+            if job.prompt and sys.stdin.isatty():
+                job.provide_input(input(f"{job.prompt} ").strip())
+    except KeyboardInterrupt:
+        logger.warning("Cancelling after the current message...")
+        job.cancel()
+        worker.join()
+    job.poll()
+    logger.info(f"{job.label}: {job.state} ({job.status})")
+    return 0 if job.state == 'done' else 1
+
+
+def show_status(max_messages=None):
+    from automation import MAX_MESSAGES_PER_DAY
+    from ledger import LEDGER_FILE, count_sent_messages
+
+    max_messages = max_messages or MAX_MESSAGES_PER_DAY
+    sent = count_sent_messages()
+    print(f"Ledger: {LEDGER_FILE}")
+    print(f"Messages sent today: {sent}/{max_messages} ({max(0, max_messages - sent)} remaining)")
+    return 0
+
+
+def migrate(excel_path=None):
+    from ledger import EXCEL_FILE, LEDGER_FILE, migrate_ledger
+
+    imported = migrate_ledger(excel_path or EXCEL_FILE)
+    print(f"Ledger: {LEDGER_FILE} ({os.path.getsize(LEDGER_FILE) / 1e6:.1f} MB)")
+    if imported:
+        print(f"Imported {imported} sent messages from {excel_path or EXCEL_FILE}")
+    return 0
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--data-dir", help="ledger, sessions and metrics directory (LINKEDIN_DATA_DIR)")
+    commands = parser.add_subparsers(dest="command", required=True)
+    run_parser = commands.add_parser("run", help="run one campaign now")
+    run_parser.add_argument("campaign", help="campaign JSON file")
+    run_parser.add_argument("--resume", action="store_true",
+                            help="message the candidates an interrupted run had left, without searching")
+    status_parser = commands.add_parser("status", help="show today's message count")
+    status_parser.add_argument("--max-messages", type=int, help="daily limit (default: the app's default)")
+    commands.add_parser("daemon", help="run the saved schedules")
+    migrate_parser = commands.add_parser("migrate", help="upgrade the ledger to the current schema")
+    migrate_parser.add_argument("--excel",
+                                help="workbook to import into an empty ledger (default: sent_messages.xlsx)")
+    args = parser.parse_args(argv)
+
+    # Set before any app module is imported, since they read it at import time
+    if args.data_dir:
+        os.environ["LINKEDIN_DATA_DIR"] = os.path.abspath(args.data_dir)
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(message)s")
+
+    try:
+        if args.command == "run":
+            return run_campaign(args.campaign, args.resume)
+        if args.command == "status":
+            return show_status(args.max_messages)
+        if args.command == "migrate":
+            return migrate(args.excel)
+        from scheduler import main as run_scheduler
+        return run_scheduler()
+    except (OSError, ValueError) as e:
+        logger.error(str(e))
+        return 2
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
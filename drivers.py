@@ -0,0 +1,194 @@
+import json
+import logging
+import os
+import time
+from datetime import datetime
+
+
+logger = logging.getLogger(__name__)
+
+# Constants
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+DRIVER_MANIFEST_FILE = os.path.join(BASE_DIR, ".chromedriver_manifest.json")
+
+# URL patterns for Network.setBlockedURLs, grouped by resource type
+RESOURCE_BLOCK_PATTERNS = {
+    'image': ["*.png", "*.jpg", "*.jpeg", "*.gif", "*.webp", "*.avif", "*.ico", "*.bmp",
+              "*media.licdn.com/dms/image/*", "*static.licdn.com/aero-v1/sc/h/*.svg"],
+    'media': ["*.mp4", "*.webm", "*.m3u8", "*.ts", "*.mp3", "*.m4a", "*.ogg",
+              "*dms.licdn.com/playlist/*"],
+    'font': ["*.woff", "*.woff2", "*.ttf", "*.otf", "*.eot"],
+}
+DEFAULT_BLOCKED_RESOURCES = ('image', 'media', 'font')
+# WebDriver error messages of a browser that crashed or was closed under the driver
+DEAD_SESSION_MARKERS = ("invalid session id", "chrome not reachable", "not connected to devtools",
+                        "session deleted", "no such window")
+
+
+def get_chrome_version():
+    # Asks the local Chrome/Chromium binary for its version; no network involved
+    try:
+        from webdriver_manager.core.os_manager import ChromeType, OperationSystemManager
+        os_manager = OperationSystemManager()
+        for chrome_type in (ChromeType.GOOGLE, ChromeType.CHROMIUM):
+            version = os_manager.get_browser_version_from_os(chrome_type)
+            if version:
+                return version
+    except Exception as e:
+        logger.warning(f"Could not detect the installed Chrome version: {str(e)}")
+    return None
+
+
+def load_driver_manifest(path=DRIVER_MANIFEST_FILE):
+    try:
+        if os.path.exists(path):
+            with open(path, encoding="utf-8") as f:
+                return json.load(f)
+    except Exception as e:
+        logger.warning(f"Ignoring unreadable driver manifest: {str(e)}")
+    return {}
+
+
+def save_driver_manifest(manifest, path=DRIVER_MANIFEST_FILE):
+    try:
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(manifest, f, indent=2)
+        os.replace(tmp_path, path)
+    except Exception as e:
+        logger.warning(f"Could not save driver manifest: {str(e)}")
+
+
+def resolve_driver_path(path=DRIVER_MANIFEST_FILE):
+    """Return (driver_path, cache_hit), calling ChromeDriverManager only when Chrome changed.
+
+    The cached driver is reused as long as the installed Chrome version matches the one it
+    was resolved for. If Chrome's version cannot be read, or a fresh resolution fails (for
+    example while offline), the cached driver is used as long as the binary still exists.
+    """
+    manifest = load_driver_manifest(path)
+    cached_path = manifest.get("driver_path")
+    cached_ok = bool(cached_path) and os.path.exists(cached_path)
+    chrome_version = get_chrome_version()
+
+    if cached_ok and (chrome_version is None or chrome_version == manifest.get("chrome_version")):
+        return cached_path, True
+
+    try:
+        from webdriver_manager.chrome import ChromeDriverManager
+        driver_path = ChromeDriverManager().install()
+    except Exception as e:
+        if cached_ok:
+            logger.warning(f"Driver resolution failed, using cached chromedriver: {str(e)}")
+            return cached_path, True
+        raise
+
+    save_driver_manifest({
+        "chrome_version": chrome_version,
+        "driver_path": driver_path,
+        "resolved_at": datetime.now().isoformat(timespec="seconds"),
+    }, path)
+    logger.info(f"Resolved chromedriver for Chrome {chrome_version}: {driver_path}")
+    return driver_path, False
+
+
+def blocked_url_patterns(allowed_resources=()):
+    return [pattern
+            for resource in DEFAULT_BLOCKED_RESOURCES if resource not in allowed_resources
+            for pattern in RESOURCE_BLOCK_PATTERNS[resource]]
+
+
+def apply_resource_policy(driver, allowed_resources=()):
+    # Blocks the default heavy resource types except the allowed ones; returns the blocked types
+    blocked = [resource for resource in DEFAULT_BLOCKED_RESOURCES if resource not in allowed_resources]
+    try:
+        driver.execute_cdp_cmd("Network.enable", {})
+        driver.execute_cdp_cmd("Network.setBlockedURLs", {"urls": blocked_url_patterns(allowed_resources)})
+        logger.info(f"Blocking resource types: {', '.join(blocked) or 'none'}")
+        return blocked
+    except Exception as e:
+        logger.warning(f"Could not apply resource policy: {str(e)}")
+        return []
+
+
+def collect_network_stats(driver, network_stats):
+    """Drain Chrome's performance log into network_stats ('bytes', 'requests', 'blocked').
+
+    Needs the goog:loggingPrefs performance capability that create_driver sets. The log is
+    emptied on every read, so call this before the driver quits, and as often as convenient.
+    """
+    try:
+        entries = driver.get_log("performance")
+    except Exception as e:
+        logger.warning(f"Could not read network log: {str(e)}")
+        return network_stats
+    for entry in entries:
+        message = json.loads(entry["message"])["message"]
+        if message["method"] == "Network.loadingFinished":
+            network_stats['requests'] = network_stats.get('requests', 0) + 1
+            network_stats['bytes'] = network_stats.get('bytes', 0) + message["params"].get("encodedDataLength", 0)
+        elif message["method"] == "Network.loadingFailed" and message["params"].get("blockedReason"):
+            network_stats['blocked'] = network_stats.get('blocked', 0) + 1
+    return network_stats
+
+
+def browser_rss(driver):
+    # Resident memory of chromedriver's Chrome process tree, in bytes (None without psutil)
+    try:
+        import psutil
+    except ImportError:
+        return None
+    try:
+        process = psutil.Process(driver.service.process.pid)
+        return sum(child.memory_info().rss for child in process.children(recursive=True))
+    except Exception as e:
+        logger.warning(f"Could not measure browser memory: {str(e)}")
+        return None
+
+
+def sample_browser_usage(driver, browser_stats):
+    # Folds the network log so far into browser_stats and keeps the peak browser RSS seen
+    collect_network_stats(driver, browser_stats)
+    rss = browser_rss(driver)
+    if rss is not None:
+        browser_stats['peak_rss'] = max(browser_stats.get('peak_rss', 0), rss)
+    return browser_stats
+
+
+def create_driver(chrome_options, startup_stats=None, allowed_resources=()):
+    # startup_stats, if given, is filled with the driver resolution and browser launch timings
+    from selenium import webdriver
+    from selenium.webdriver.chrome.service import Service
+
+    start = time.perf_counter()
+    driver_path, cache_hit = resolve_driver_path()
+    resolved = time.perf_counter()
+    # Network events feed collect_network_stats
+    chrome_options.set_capability("goog:loggingPrefs", {"performance": "ALL"})
+    driver = webdriver.Chrome(service=Service(driver_path), options=chrome_options)
+    apply_resource_policy(driver, allowed_resources)
+    ready = time.perf_counter()
+
+    stats = {
+        'driver_cache_hit': cache_hit,
+        'resolve_seconds': resolved - start,
+        'launch_seconds': ready - resolved,
+        'ready_seconds': ready - start,
+    }
+    if startup_stats is not None:
+        startup_stats.update(stats)
+    logger.info(f"WebDriver ready in {stats['ready_seconds']:.2f}s "
+                f"(driver {'cached' if cache_hit else 'resolved'} in {stats['resolve_seconds']:.2f}s)")
+    return driver
+
+
+def session_is_dead(error):
+    # True when `error` means the browser or chromedriver is gone, so every further command
+    # would fail too; other errors only concern the element or page at hand
+    from selenium.common.exceptions import InvalidSessionIdException, WebDriverException
+    from urllib3.exceptions import HTTPError
+
+    if isinstance(error, (InvalidSessionIdException, ConnectionError, HTTPError)):
+        return True
+    return isinstance(error, WebDriverException) and any(
+        marker in str(error).lower() for marker in DEAD_SESSION_MARKERS)
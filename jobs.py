@@ -0,0 +1,211 @@
+import logging
+import queue
+import threading
+import time
+import traceback
+import uuid
+from datetime import datetime
+
+
+logger = logging.getLogger(__name__)
+
+# Constants
+MAX_FINISHED_JOBS = 20  # finished jobs kept for the dashboard
+FINISHED_STATES = ('done', 'failed', 'cancelled')
+LOGGED_EVENTS = {'info': logging.INFO, 'success': logging.INFO, 'warning': logging.WARNING, 'error': logging.ERROR}
+
+
+class Job:
+    """One unit of work for the JobRunner, plus everything it has reported so far.
+
+    The worker reports through emit(), which only puts events on a queue. poll() drains the
+    queue into an append-only event list, so any number of viewers can follow the same job
+    by keeping their own cursor into events_since().
+    """
+
+    def __init__(self, target, args=(), kwargs=None, label=None):
+        self.id = uuid.uuid4().hex[:12]
+        self.label = label or getattr(target, "__name__", "job")
+        self.target = target
+        self.args = args
+        self.kwargs = kwargs or {}
+        self.created_at = datetime.now()
+        self.started_at = None
+        self.finished_at = None
+        self.state = 'queued'
+        self.progress = 0.0
+        self.status = "Waiting for the worker"
+        self.prompt = None  # set while the worker waits for provide_input()
+        self.result = None
+        self.error = None
+        self.events = []
+        self._queue = queue.Queue()
+        self._inputs = queue.Queue()
+        self._lock = threading.Lock()
+        self._cancel = threading.Event()
+
+    # Worker side
+
+    def emit(self, kind, text="", **data):
+        # Messages also go to the log, for runs nobody is watching (scheduled or headless)
+        if kind in LOGGED_EVENTS:
+            logger.log(LOGGED_EVENTS[kind], f"[{self.id}] {text}")
+        self._queue.put({'time': time.time(), 'kind': kind, 'text': text, **data})
+
+    def set_progress(self, fraction, status=None):
+        self.emit('progress', status or "", value=fraction)
+
+    def request_input(self, prompt, timeout=None, done=None):
+        # Blocks the worker until a viewer answers; returns None on timeout, on cancel, or
+        # once the optional done() check (run every second) reports the answer isn't needed
+        self.emit('input', prompt)
+        try:
+            deadline = None if timeout is None else time.monotonic() + timeout
+            while not self._cancel.is_set() and not (done and done()):
+                wait = 1 if deadline is None else min(1, deadline - time.monotonic())
+                if wait <= 0:
+                    return None
+                try:
+                    return self._inputs.get(timeout=wait)
+                except queue.Empty:
+                    continue
+            return None
+        finally:
+            self.emit('input_done')
+
+    def run(self):
+        # Runs the job on the calling thread, reporting its state changes as events
+        if self.cancelled:
+            self.emit('state', 'cancelled', status="Cancelled before it started")
+            return
+        self.started_at = datetime.now()
+        self.emit('state', 'running', status="Running")
+        try:
+            self.result = self.target(self, *self.args, **self.kwargs)
+            # A finished job keeps the last status it reported
+            self.emit('state', 'cancelled' if self.cancelled else 'done')
+        except Exception as e:
+            self.error = str(e)
+            logger.error(f"Job {self.id} failed: {str(e)}\n{traceback.format_exc()}")
+            self.emit('error', f"An error occurred: {str(e)}")
+            self.emit('state', 'failed', status=f"Failed: {str(e)}")
+        finally:
+            self.finished_at = datetime.now()
+
+    @property
+    def cancelled(self):
+        return self._cancel.is_set()
+
+    # Viewer side
+
+    def poll(self):
+        # Moves queued events into the shared event list and folds them into the job's state
+        with self._lock:
+            while True:
+                try:
+                    event = self._queue.get_nowait()
+                except queue.Empty:
+                    break
+                self.events.append(event)
+                if event['kind'] == 'progress':
+                    self.progress = event['value']
+                    self.status = event['text'] or self.status
+                elif event['kind'] == 'state':
+                    self.state = event['text']
+                    if event.get('status'):
+                        self.status = event['status']
+                    elif self.status == "Running":
+                        self.status = "Finished"
+                elif event['kind'] == 'input':
+                    self.prompt = event['text']
+                elif event['kind'] == 'input_done':
+                    self.prompt = None
+            return len(self.events)
+
+    def events_since(self, cursor=0):
+        self.poll()
+        with self._lock:
+            return self.events[cursor:], len(self.events)
+
+    def provide_input(self, value):
+        self._inputs.put(value)
+
+    def cancel(self):
+        self._cancel.set()
+
+    @property
+    def finished(self):
+        self.poll()
+        return self.state in FINISHED_STATES
+
+
+class JobRunner:
+    """Runs submitted jobs one at a time on a daemon worker thread.
+
+    Jobs run in submission order, one browser at a time within this process. Across processes
+    (the app, the scheduler daemon, `cli.py run`), sessions.lock_session keeps an account's
+    browser profile to one run at a time.
+    """
+
+    def __init__(self):
+        self.jobs = {}
+        self._pending = queue.Queue()
+        self._lock = threading.Lock()
+        self._worker = None
+
+    def submit(self, target, *args, label=None, **kwargs):
+        # target is called as target(job, *args, **kwargs) on the worker thread
+        job = Job(target, args, kwargs, label)
+        with self._lock:
+            self.jobs[job.id] = job
+            self._prune()
+            if self._worker is None or not self._worker.is_alive():
+                self._worker = threading.Thread(target=self._work, name="job-runner", daemon=True)
+                self._worker.start()
+        self._pending.put(job)
+        logger.info(f"Queued job {job.id} ({job.label})")
+        return job
+
+    def get(self, job_id):
+        return self.jobs.get(job_id)
+
+    def active_job(self):
+        # The running job, else the oldest queued one
+        with self._lock:
+            jobs = list(self.jobs.values())
+        for state in ('running', 'queued'):
+            for job in jobs:
+                job.poll()
+                if job.state == state:
+                    return job
+        return None
+
+    def recent_jobs(self, limit=MAX_FINISHED_JOBS):
+        with self._lock:
+            jobs = sorted(self.jobs.values(), key=lambda job: job.created_at, reverse=True)
+        for job in jobs:
+            job.poll()
+        return jobs[:limit]
+
+    def _prune(self):
+        finished = [job for job in self.jobs.values() if job.finished]
+        finished.sort(key=lambda job: job.created_at)
+        for job in finished[:max(0, len(finished) - MAX_FINISHED_JOBS)]:
+            del self.jobs[job.id]
+
+    def _work(self):
+        while True:
+            self._pending.get().run()
+
+
+# One runner per process, shared by every Streamlit session (browser tab)
+_runner = None
+_runner_lock = threading.Lock()
+
+
+def get_runner():
+    global _runner
+    with _runner_lock:
+        if _runner is None:
+            _runner = JobRunner()
+        return _runner
@@ -0,0 +1,124 @@
+import json
+import logging
+import os
+import uuid
+from contextlib import contextmanager
+from datetime import datetime
+
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+
+from ledger import LEDGER_FILE, is_recorded, record_sent_message
+from paths import BASE_DIR, ensure_parent_dir
+
+
+logger = logging.getLogger(__name__)
+
+# Constants
+JOURNAL_FILE = os.path.join(BASE_DIR, "send_journal.jsonl")
+
+
+@contextmanager
+def _journal_lock(path):
+    # The app, the scheduler daemon and `cli.py run` share one journal; recovery holds this
+    # while it reads, records and empties the journal, so no append can land in between
+    with open(f"{ensure_parent_dir(path)}.lock", "a") as lock_file:
+        if fcntl is not None:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            if fcntl is not None:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+
+def _append(record, path, durable):
+    with _journal_lock(path), open(path, "a", encoding="utf-8") as f:
+        f.write(json.dumps(record) + "\n")
+        if durable:
+            f.flush()
+            os.fsync(f.fileno())
+
+
+def journal_send(email, profile_url, name, title, message, date=None, path=JOURNAL_FILE):
+    """Durably note a message that was just sent, before it is recorded in the ledger.
+
+    Returns the entry id to pass to journal_recorded once record_sent_message succeeded, or
+    None if the journal could not be written. If the process dies in between, recover_journal
+    adds the send to the ledger on the next start, so the recipient is never messaged twice.
+    """
+    entry_id = uuid.uuid4().hex
+    try:
+        _append({
+            'id': entry_id,
+            'state': 'sent',
+            'email': email,
+            'profile_url': profile_url,
+            'name': name,
+            'title': title,
+            'message': message,
+            'date': (date or datetime.now()).isoformat(sep=' '),
+        }, path, durable=True)
+        return entry_id
+    except Exception as e:
+        # The ledger write that follows still records the send
+        logger.error(f"Error journaling sent message: {str(e)}")
+        return None
+
+
+def journal_recorded(entry_id, path=JOURNAL_FILE):
+    # Not fsynced: if this line is lost, recovery finds the row already in the ledger and skips it
+    if entry_id is None:
+        return
+    try:
+        _append({'id': entry_id, 'state': 'recorded'}, path, durable=False)
+    except Exception as e:
+        logger.error(f"Error updating send journal: {str(e)}")
+
+
+def pending_sends(path=JOURNAL_FILE):
+    # Sends that were journaled but never marked as recorded; a torn last line is ignored
+    pending = {}
+    if not os.path.exists(path):
+        return []
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            try:
+                record = json.loads(line)
+            except ValueError:
+                logger.warning("Ignoring an incomplete send journal entry")
+                continue
+            if record['state'] == 'sent':
+                pending[record['id']] = record
+            else:
+                pending.pop(record['id'], None)
+    return list(pending.values())
+
+
+def recover_journal(path=JOURNAL_FILE, ledger_path=LEDGER_FILE):
+    """Fold sends the ledger missed into it, then empty the journal. Returns how many were added."""
+    try:
+        if not os.path.exists(path) or os.path.getsize(path) == 0:
+            return 0
+        recovered = 0
+        with _journal_lock(path):
+            for entry in pending_sends(path):
+                date = datetime.fromisoformat(entry['date'])
+                # The ledger row may have been written without its 'recorded' line
+                if is_recorded(entry['profile_url'], date, ledger_path):
+                    continue
+                # A send another process is about to record itself is fine to fold in too:
+                # record_sent_message skips a row that is already there
+                if not record_sent_message(entry['email'], entry['profile_url'], entry['name'], entry['title'],
+                                           entry['message'], date=date, path=ledger_path):
+                    return recovered  # keep the journal for the next attempt
+                recovered += 1
+            os.truncate(path, 0)
+        if recovered:
+            logger.warning(f"Recovered {recovered} sent messages from the send journal")
+        return recovered
+    except Exception as e:
+        logger.error(f"Error recovering the send journal: {str(e)}")
+        return 0
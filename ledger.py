@@ -0,0 +1,521 @@
+import logging
+import os
+import re
+import sqlite3
+from datetime import datetime, timedelta
+from functools import lru_cache
+from urllib.parse import unquote
+
+from paths import BASE_DIR
+
+
+logger = logging.getLogger(__name__)
+
+# Constants
+LEDGER_FILE = os.path.join(BASE_DIR, "sent_messages.db")
+EXCEL_FILE = os.path.join(BASE_DIR, "sent_messages.xlsx")
+COLUMNS = ["Email", "ProfileURL", "Name", "Title", "Date", "Message"]
+# pandas is only imported by the DataFrame helpers, so quota checks and recording stay light
+
+# Sender accounts, search titles and message bodies repeat on almost every row, so each is
+# stored once in a lookup table and referenced by id. SentAt is microseconds since
+# 1970-01-01 in local time (naive, like datetime.now()).
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS accounts (id INTEGER PRIMARY KEY, Email TEXT NOT NULL UNIQUE);
+CREATE TABLE IF NOT EXISTS titles (id INTEGER PRIMARY KEY, Title TEXT NOT NULL UNIQUE);
+CREATE TABLE IF NOT EXISTS messages (id INTEGER PRIMARY KEY, Body TEXT NOT NULL UNIQUE);
+CREATE TABLE IF NOT EXISTS sent_messages (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    AccountID INTEGER REFERENCES accounts (id),
+    ProfileURL TEXT,
+    ProfileID TEXT,
+    Name TEXT,
+    TitleID INTEGER REFERENCES titles (id),
+    SentAt INTEGER,
+    MessageID INTEGER REFERENCES messages (id)
+);
+CREATE INDEX IF NOT EXISTS idx_sent_messages_profile_id ON sent_messages (ProfileID);
+CREATE INDEX IF NOT EXISTS idx_sent_messages_sent_at ON sent_messages (SentAt);
+CREATE INDEX IF NOT EXISTS idx_sent_messages_title_id ON sent_messages (TitleID);
+"""
+# Lookup tables behind the Email, Title and Message columns: (column, table, table column, key)
+LOOKUPS = [
+    ("Email", "accounts", "Email", "AccountID"),
+    ("Title", "titles", "Title", "TitleID"),
+    ("Message", "messages", "Body", "MessageID"),
+]
+# Stored as PRAGMA user_version. 1: canonical profile IDs; 2: lookup tables and SentAt
+SCHEMA_VERSION = 2
+EPOCH = datetime(1970, 1, 1)
+
+# The old all-text table, converted by _upgrade_schema. Dates were ISO strings with optional
+# microseconds, which strftime('%s') reads as-is.
+LEGACY_COPY = """
+INSERT OR IGNORE INTO accounts (Email) SELECT DISTINCT Email FROM legacy_sent_messages WHERE Email IS NOT NULL;
+INSERT OR IGNORE INTO titles (Title) SELECT DISTINCT Title FROM legacy_sent_messages WHERE Title IS NOT NULL;
+INSERT OR IGNORE INTO messages (Body) SELECT DISTINCT Message FROM legacy_sent_messages WHERE Message IS NOT NULL;
+INSERT INTO sent_messages (id, AccountID, ProfileURL, ProfileID, Name, TitleID, SentAt, MessageID)
+SELECT legacy.id, accounts.id, legacy.ProfileURL, legacy.ProfileID, legacy.Name, titles.id,
+       CAST(strftime('%s', legacy.Date) AS INTEGER) * 1000000 + CAST(substr(legacy.Date, 21, 6) AS INTEGER),
+       messages.id
+FROM legacy_sent_messages AS legacy
+LEFT JOIN accounts ON accounts.Email = legacy.Email
+LEFT JOIN titles ON titles.Title = legacy.Title
+LEFT JOIN messages ON messages.Body = legacy.Message
+ORDER BY legacy.id;
+DROP TABLE legacy_sent_messages;
+"""
+# The vanity name after /in/ on any host (www., country subdomains, no host at all), ignoring
+# whatever follows it (/overlay/..., query strings, fragments). Names are percent-decoded and
+# lowercased, since LinkedIn treats them case-insensitively.
+PROFILE_ID_PATTERN = r"^(?:[a-z][a-z0-9+.-]*://)?[^/?#]*/in/([^/?#]+)"
+PROFILE_ID_RE = re.compile(PROFILE_ID_PATTERN, re.IGNORECASE)
+
+
+@lru_cache(maxsize=4096)
+def _canonical_profile_id(url):
+    match = PROFILE_ID_RE.match(url)
+    if not match:
+        return None
+    return unquote(match.group(1)).lower() or None
+
+
+def get_profile_id(url):
+    try:
+        if not isinstance(url, str):
+            return None
+        return _canonical_profile_id(url)
+    except Exception as e:
+        logger.error(f"Error extracting profile ID: {str(e)}")
+        return None
+
+
+def get_profile_ids(urls):
+    """Vectorized get_profile_id over a Series of URLs; None where there is no profile ID."""
+    ids = urls.astype("string").str.extract(PROFILE_ID_PATTERN, flags=re.IGNORECASE, expand=False)
+    # Only the few percent-encoded names need decoding one by one
+    encoded = ids.str.contains("%", regex=False, na=False)
+    if encoded.any():
+        ids[encoded] = ids[encoded].map(unquote)
+    ids = ids.str.lower().replace("", None)
+    return ids.astype(object).where(ids.notna(), None)
+
+
+def _timestamp(value):
+    # SentAt for a datetime (or anything pandas reads as one); None for missing dates
+    if value is None:
+        return None
+    if type(value) is not datetime:
+        import pandas as pd
+        if pd.isna(value):
+            return None
+        value = pd.Timestamp(value).to_pydatetime()
+    return (value - EPOCH) // timedelta(microseconds=1)
+
+
+def _datetime(timestamp):
+    return None if timestamp is None else EPOCH + timedelta(microseconds=timestamp)
+
+
+def _lookup_id(conn, lookup, value):
+    # Id of `value` in a lookup table, adding it on first use
+    if value is None:
+        return None
+    _, table, column, _ = lookup
+    conn.execute(f"INSERT OR IGNORE INTO {table} ({column}) VALUES (?)", (value,))
+    return conn.execute(f"SELECT id FROM {table} WHERE {column} = ?", (value,)).fetchone()[0]
+
+
+def _lookup_ids(conn, lookup, values):
+    # Bulk _lookup_id for a Series: each distinct value is inserted and looked up once
+    _, table, column, _ = lookup
+    values = values.astype(str).where(values.notna(), None)
+    distinct = [(value,) for value in values.dropna().unique().tolist()]
+    conn.executemany(f"INSERT OR IGNORE INTO {table} ({column}) VALUES (?)", distinct)
+    ids = dict(conn.execute(f"SELECT {column}, id FROM {table}").fetchall())
+    return values.map(ids).astype("Int64")
+
+
+def _sql_values(series):
+    # Python values for sqlite3, with None for every kind of missing value
+    import pandas as pd
+    return [None if pd.isna(value) else value for value in series.tolist()]
+
+
+def _insert_frame(conn, df):
+    # Appends a DataFrame with COLUMNS; profile IDs and lookup ids are computed in one pass each
+    import pandas as pd
+
+    df = df.copy()
+    for col in COLUMNS:
+        if col not in df.columns:
+            df[col] = None
+    dates = pd.to_datetime(df['Date'], errors='coerce')
+    sent_at = pd.Series(dates.to_numpy(dtype="datetime64[us]").view("int64"), dtype="Int64")
+    sent_at[dates.isna().to_numpy()] = pd.NA
+    values = {
+        'ProfileURL': _sql_values(df['ProfileURL']),
+        'ProfileID': _sql_values(get_profile_ids(df['ProfileURL'])),
+        'Name': _sql_values(df['Name']),
+        'SentAt': _sql_values(sent_at),
+    }
+    for lookup in LOOKUPS:
+        values[lookup[3]] = _sql_values(_lookup_ids(conn, lookup, df[lookup[0]]))
+    columns = list(values)
+    conn.executemany(f"INSERT INTO sent_messages ({', '.join(columns)}) VALUES ({', '.join('?' * len(columns))})",
+                     zip(*values.values()))
+    return len(df)
+
+
+def connect(path=LEDGER_FILE):
+    is_new = not os.path.exists(path)
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    conn = sqlite3.connect(path, timeout=30)
+    # WAL keeps readers off the writer's back and makes an interrupted append roll back cleanly
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    (version,) = conn.execute("PRAGMA user_version").fetchone()
+    if version < SCHEMA_VERSION:
+        _upgrade_schema(conn)
+    if is_new and path == LEDGER_FILE and os.path.exists(EXCEL_FILE):
+        import_from_excel(conn, EXCEL_FILE)
+    return conn
+
+
+def _upgrade_schema(conn):
+    # Brings a ledger written by an older version up to SCHEMA_VERSION in one transaction. The
+    # write lock is taken first, so a second process waits and then finds the work done.
+    conn.execute("BEGIN IMMEDIATE")
+    try:
+        (version,) = conn.execute("PRAGMA user_version").fetchone()
+        legacy = 'Date' in [row[1] for row in conn.execute("PRAGMA table_info(sent_messages)")]
+        if version < SCHEMA_VERSION:
+            script = SCHEMA
+            if legacy:
+                script = ("ALTER TABLE sent_messages RENAME TO legacy_sent_messages;"
+                          "DROP INDEX IF EXISTS idx_sent_messages_profile_id;"
+                          "DROP INDEX IF EXISTS idx_sent_messages_date;"
+                          "DROP INDEX IF EXISTS idx_sent_messages_title;" + SCHEMA + LEGACY_COPY)
+            # executescript would commit first, so the statements are run one by one
+            for statement in script.split(";"):
+                if statement.strip():
+                    conn.execute(statement)
+            if version < 1:
+                _rebuild_profile_ids(conn)
+            conn.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+        conn.commit()
+    except Exception:
+        conn.rollback()
+        raise
+    if legacy and version < SCHEMA_VERSION:
+        # Hand the space of the old text columns back to the file system
+        conn.execute("VACUUM")
+        logger.info("Converted the sent messages ledger to the normalized schema")
+
+
+def _rebuild_profile_ids(conn):
+    # Stores IDs under the current rules (older ledgers kept the URL's raw casing and encoding)
+    if conn.execute("SELECT 1 FROM sent_messages LIMIT 1").fetchone():
+        import pandas as pd
+
+        df = pd.read_sql_query("SELECT id, ProfileURL FROM sent_messages", conn)
+        df['ProfileID'] = get_profile_ids(df['ProfileURL'])
+        conn.executemany("UPDATE sent_messages SET ProfileID = ? WHERE id = ?",
+                         zip(df['ProfileID'].tolist(), df['id'].tolist()))
+        logger.info(f"Recomputed profile IDs for {len(df)} sent messages")
+
+
+def import_from_excel(conn, excel_path):
+    # Migration from the workbook the app kept before the SQLite ledger
+    import pandas as pd
+
+    try:
+        with conn:
+            imported = _insert_frame(conn, pd.read_excel(excel_path))
+        logger.info(f"Imported {imported} sent messages from {excel_path}")
+        return imported
+    except Exception as e:
+        logger.error(f"Error importing sent messages from Excel: {str(e)}")
+        return 0
+
+
+def migrate_ledger(excel_path=EXCEL_FILE, path=LEDGER_FILE):
+    """Upgrade the ledger to the current schema and, if it is still empty, import `excel_path`.
+
+    Returns the number of rows imported from the workbook. Safe to run more than once.
+    """
+    conn = connect(path)
+    try:
+        if excel_path and os.path.exists(excel_path) and \
+                not conn.execute("SELECT 1 FROM sent_messages LIMIT 1").fetchone():
+            return import_from_excel(conn, excel_path)
+        return 0
+    finally:
+        conn.close()
+
+
+def _categorical(keys, lookup):
+    # Builds a categorical column straight from lookup ids, so no strings are hashed on load
+    import numpy as np
+    import pandas as pd
+
+    ids = lookup['id'].to_numpy()
+    codes = np.searchsorted(ids, keys.fillna(0).to_numpy(dtype="int64"))
+    codes[keys.isna().to_numpy()] = -1
+    return pd.Categorical.from_codes(codes, categories=lookup.iloc[:, 1])
+
+
+def load_sent_messages(path=LEDGER_FILE):
+    # Email, Title and Message come back as categoricals, Date as datetime64
+    import pandas as pd
+
+    try:
+        conn = connect(path)
+        try:
+            keys = {key: "Int64" for *_, key in LOOKUPS}
+            rows = pd.read_sql_query(
+                "SELECT AccountID, ProfileURL, Name, TitleID, SentAt, MessageID FROM sent_messages ORDER BY id",
+                conn, dtype={**keys, 'SentAt': "Int64"})
+            lookups = {column: pd.read_sql_query(f"SELECT id, {table_column} FROM {table} ORDER BY id", conn)
+                       for column, table, table_column, _ in LOOKUPS}
+        finally:
+            conn.close()
+        df = pd.DataFrame({
+            'Email': _categorical(rows['AccountID'], lookups['Email']),
+            'ProfileURL': rows['ProfileURL'],
+            'Name': rows['Name'],
+            'Title': _categorical(rows['TitleID'], lookups['Title']),
+            'Date': pd.to_datetime(rows['SentAt'], unit="us"),
+            'Message': _categorical(rows['MessageID'], lookups['Message']),
+        })
+        return df
+    except Exception as e:
+        logger.error(f"Error loading sent messages: {str(e)}")
+        return pd.DataFrame(columns=COLUMNS)
+
+
+def ledger_version(path=LEDGER_FILE):
+    # Changes on every write; in WAL mode appends land in the -wal file until a checkpoint
+    version = []
+    for file_path in (path, f"{path}-wal"):
+        try:
+            stat = os.stat(file_path)
+            version.append((stat.st_mtime_ns, stat.st_size))
+        except OSError:
+            version.append(None)
+    return tuple(version)
+
+
+def _history_filter(start=None, end=None, title=None):
+    # start and end are inclusive dates; both bounds use the SentAt index
+    clauses, params = [], []
+    if start:
+        clauses.append("SentAt >= ?")
+        params.append(_timestamp(datetime.combine(start, datetime.min.time())))
+    if end:
+        clauses.append("SentAt < ?")
+        params.append(_timestamp(datetime.combine(end + timedelta(days=1), datetime.min.time())))
+    if title:
+        clauses.append("TitleID = (SELECT id FROM titles WHERE Title = ?)")
+        params.append(title)
+    return (" WHERE " + " AND ".join(clauses) if clauses else ""), params
+
+
+def count_matching_messages(start=None, end=None, title=None, path=LEDGER_FILE):
+    try:
+        where, params = _history_filter(start, end, title)
+        conn = connect(path)
+        try:
+            (count,) = conn.execute(f"SELECT COUNT(*) FROM sent_messages{where}", params).fetchone()
+        finally:
+            conn.close()
+        return count
+    except Exception as e:
+        logger.error(f"Error counting sent messages: {str(e)}")
+        return 0
+
+
+def query_sent_messages(start=None, end=None, title=None, limit=100, offset=0, path=LEDGER_FILE):
+    # One page of the history, newest first; filtering and paging happen in SQLite, so only
+    # `limit` rows reach pandas however big the ledger is
+    import pandas as pd
+
+    try:
+        where, params = _history_filter(start, end, title)
+        conn = connect(path)
+        try:
+            df = pd.read_sql_query(
+                "SELECT accounts.Email, ProfileURL, Name, titles.Title, SentAt AS Date, messages.Body AS Message "
+                "FROM sent_messages LEFT JOIN accounts ON accounts.id = AccountID "
+                "LEFT JOIN titles ON titles.id = TitleID LEFT JOIN messages ON messages.id = MessageID"
+                f"{where} ORDER BY sent_messages.id DESC LIMIT ? OFFSET ?", conn,
+                params=params + [limit, offset], dtype={'Date': "Int64"})
+        finally:
+            conn.close()
+        df['Date'] = pd.to_datetime(df['Date'], unit="us")
+        return df
+    except Exception as e:
+        logger.error(f"Error querying sent messages: {str(e)}")
+        return pd.DataFrame(columns=COLUMNS)
+
+
+def history_summary(path=LEDGER_FILE):
+    # Totals for the history panel; recipients are counted by profile ID, falling back to the URL
+    summary = {'total': 0, 'recipients': 0, 'first': None, 'last': None, 'titles': {}}
+    try:
+        conn = connect(path)
+        try:
+            total, recipients, first, last = conn.execute(
+                "SELECT COUNT(*), COUNT(DISTINCT COALESCE(ProfileID, ProfileURL)), MIN(SentAt), MAX(SentAt) "
+                "FROM sent_messages").fetchone()
+            titles = conn.execute(
+                "SELECT titles.Title, COUNT(*) FROM sent_messages JOIN titles ON titles.id = TitleID "
+                "GROUP BY TitleID ORDER BY COUNT(*) DESC").fetchall()
+        finally:
+            conn.close()
+        summary.update({
+            'total': total,
+            'recipients': recipients,
+            'first': _datetime(first).date() if first is not None else None,
+            'last': _datetime(last).date() if last is not None else None,
+            'titles': dict(titles),
+        })
+    except Exception as e:
+        logger.error(f"Error summarizing sent messages: {str(e)}")
+    return summary
+
+
+def load_recipient_ids(path=LEDGER_FILE):
+    # Built once per run; callers add to it as sends are recorded
+    try:
+        conn = connect(path)
+        try:
+            rows = conn.execute(
+                "SELECT DISTINCT ProfileID FROM sent_messages WHERE ProfileID IS NOT NULL").fetchall()
+        finally:
+            conn.close()
+        return {row[0] for row in rows}
+    except Exception as e:
+        logger.error(f"Error loading recipient index: {str(e)}")
+        return set()
+
+
+def is_duplicate_recipient(recipient_ids, profile_url):
+    profile_id = get_profile_id(profile_url)
+    if not profile_id:
+        return False
+    return profile_id in recipient_ids
+
+
+def count_sent_messages(day=None, path=LEDGER_FILE):
+    # Range scan on the SentAt index, so the cost depends on that day's sends rather than the history size
+    try:
+        day = day or datetime.now().date()
+        start = _timestamp(datetime.combine(day, datetime.min.time()))
+        end = _timestamp(datetime.combine(day + timedelta(days=1), datetime.min.time()))
+        conn = connect(path)
+        try:
+            (count,) = conn.execute(
+                "SELECT COUNT(*) FROM sent_messages WHERE SentAt >= ? AND SentAt < ?", (start, end)).fetchone()
+        finally:
+            conn.close()
+        return count
+    except Exception as e:
+        logger.error(f"Error counting sent messages: {str(e)}")
+        return 0
+
+
+def remaining_quota(limit, day=None, path=LEDGER_FILE):
+    return max(0, limit - count_sent_messages(day, path))
+
+
+def daily_limit_reached(limit, day=None, path=LEDGER_FILE):
+    return remaining_quota(limit, day, path) == 0
+
+
+def record_sent_message(email, profile_url, name, title, message, date=None, path=LEDGER_FILE):
+    # Idempotent per (ProfileURL, date): journal recovery in another process may have recorded
+    # this send already, and it must not use up a second quota slot
+    try:
+        sent_at = _timestamp(date or datetime.now())
+        conn = connect(path)
+        try:
+            with conn:
+                conn.execute(
+                    "INSERT INTO sent_messages (AccountID, ProfileURL, ProfileID, Name, TitleID, SentAt, MessageID) "
+                    "SELECT ?, ?, ?, ?, ?, ?, ? WHERE NOT EXISTS "
+                    "(SELECT 1 FROM sent_messages WHERE SentAt = ? AND ProfileURL = ?)",
+                    (_lookup_id(conn, LOOKUPS[0], email), profile_url, get_profile_id(profile_url), name,
+                     _lookup_id(conn, LOOKUPS[1], title), sent_at, _lookup_id(conn, LOOKUPS[2], message),
+                     sent_at, profile_url))
+        finally:
+            conn.close()
+        return True
+    except Exception as e:
+        logger.error(f"Error recording sent message: {str(e)}")
+        return False
+
+
+def is_recorded(profile_url, date, path=LEDGER_FILE):
+    # Exact match on one send, used to make journal recovery idempotent
+    try:
+        conn = connect(path)
+        try:
+            row = conn.execute("SELECT 1 FROM sent_messages WHERE ProfileURL = ? AND SentAt = ?",
+                               (profile_url, _timestamp(date))).fetchone()
+        finally:
+            conn.close()
+        return row is not None
+    except Exception as e:
+        logger.error(f"Error looking up sent message: {str(e)}")
+        return False
+
+
+def _delete_all(conn):
+    # Message bodies go with the history that referenced them
+    conn.execute("DELETE FROM sent_messages")
+    for _, table, _, _ in LOOKUPS:
+        conn.execute(f"DELETE FROM {table}")
+
+
+def save_sent_messages(df, path=LEDGER_FILE):
+    # Replaces the whole ledger with df; the send loop uses record_sent_message instead
+    try:
+        conn = connect(path)
+        try:
+            with conn:
+                _delete_all(conn)
+                _insert_frame(conn, df)
+        finally:
+            conn.close()
+        return True
+    except Exception as e:
+        logger.error(f"Error saving sent messages: {str(e)}")
+        return False
+
+
+def export_to_excel(excel_path=EXCEL_FILE, path=LEDGER_FILE):
+    # Written next to the target and swapped in, so a crash never leaves a truncated workbook
+    try:
+        df = load_sent_messages(path)
+        tmp_path = f"{excel_path}.tmp.xlsx"
+        df.to_excel(tmp_path, index=False, engine='openpyxl')
+        os.replace(tmp_path, excel_path)
+        return True
+    except Exception as e:
+        logger.error(f"Error exporting sent messages: {str(e)}")
+        return False
+
+
+def clear_sent_messages(path=LEDGER_FILE):
+    try:
+        conn = connect(path)
+        try:
+            with conn:
+                _delete_all(conn)
+        finally:
+            conn.close()
+        return True
+    except Exception as e:
+        logger.error(f"Error clearing sent messages: {str(e)}")
+        return False
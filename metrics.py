@@ -0,0 +1,144 @@
+import json
+import logging
+import os
+import threading
+import time
+import uuid
+from collections import defaultdict
+from contextlib import contextmanager
+from datetime import datetime
+
+from paths import BASE_DIR, ensure_parent_dir
+
+
+logger = logging.getLogger(__name__)
+
+# Constants
+METRICS_JSONL_FILE = os.path.join(BASE_DIR, "run_metrics.jsonl")
+METRICS_PROM_FILE = os.path.join(BASE_DIR, "run_metrics.prom")
+PROM_PREFIX = "linkedin_automation"
+
+# The run being measured on this thread; spans outside a run are not recorded
+_local = threading.local()
+
+
+class RunMetrics:
+    """Span durations and counters for one automation run."""
+
+    def __init__(self, run_id=None):
+        self.run_id = run_id or uuid.uuid4().hex[:12]
+        self.started_at = datetime.now()
+        self.start = time.perf_counter()
+        self.end = None
+        self.spans = defaultdict(lambda: {'count': 0, 'total': 0.0, 'max': 0.0})
+        self.counters = defaultdict(float)
+
+    def add_span(self, name, seconds):
+        span = self.spans[name]
+        span['count'] += 1
+        span['total'] += seconds
+        span['max'] = max(span['max'], seconds)
+
+    def count(self, name, value=1):
+        self.counters[name] += value
+
+    def finish(self):
+        if self.end is None:
+            self.end = time.perf_counter()
+        return self
+
+    @property
+    def duration(self):
+        return (self.end or time.perf_counter()) - self.start
+
+    def summary(self):
+        return {
+            'run_id': self.run_id,
+            'started_at': self.started_at.isoformat(timespec="seconds"),
+            'duration': self.duration,
+            'spans': {name: dict(span) for name, span in self.spans.items()},
+            'counters': dict(self.counters),
+        }
+
+    def to_json_line(self):
+        return json.dumps(self.summary())
+
+    def to_prometheus(self):
+        lines = [
+            f"# HELP {PROM_PREFIX}_run_duration_seconds Wall time of the last run.",
+            f"# TYPE {PROM_PREFIX}_run_duration_seconds gauge",
+            f'{PROM_PREFIX}_run_duration_seconds{{run_id="{self.run_id}"}} {self.duration:.6f}',
+            f"# HELP {PROM_PREFIX}_span_seconds Time spent per phase in the last run.",
+            f"# TYPE {PROM_PREFIX}_span_seconds summary",
+        ]
+        for name, span in sorted(self.spans.items()):
+            lines.append(f'{PROM_PREFIX}_span_seconds_sum{{span="{name}"}} {span["total"]:.6f}')
+            lines.append(f'{PROM_PREFIX}_span_seconds_count{{span="{name}"}} {span["count"]}')
+        lines.append(f"# HELP {PROM_PREFIX}_span_max_seconds Longest single occurrence per phase.")
+        lines.append(f"# TYPE {PROM_PREFIX}_span_max_seconds gauge")
+        for name, span in sorted(self.spans.items()):
+            lines.append(f'{PROM_PREFIX}_span_max_seconds{{span="{name}"}} {span["max"]:.6f}')
+        lines.append(f"# HELP {PROM_PREFIX}_events Counters recorded during the last run.")
+        lines.append(f"# TYPE {PROM_PREFIX}_events gauge")
+        for name, value in sorted(self.counters.items()):
+            lines.append(f'{PROM_PREFIX}_events{{event="{name}"}} {value:g}')
+        return "\n".join(lines) + "\n"
+
+
+def start_run(run_id=None):
+    _local.run = RunMetrics(run_id)
+    return _local.run
+
+
+def current_run():
+    return getattr(_local, "run", None)
+
+
+def end_run():
+    run = current_run()
+    _local.run = None
+    return run.finish() if run else None
+
+
+@contextmanager
+def span(name):
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        run = current_run()
+        if run is not None:
+            run.add_span(name, time.perf_counter() - start)
+
+
+def count(name, value=1):
+    run = current_run()
+    if run is not None:
+        run.count(name, value)
+
+
+def export_run(run, jsonl_path=METRICS_JSONL_FILE, prom_path=METRICS_PROM_FILE):
+    # JSON lines keep the history; the .prom file holds the last run for a node_exporter textfile collector
+    try:
+        with open(ensure_parent_dir(jsonl_path), "a", encoding="utf-8") as f:
+            f.write(run.to_json_line() + "\n")
+        tmp_path = f"{ensure_parent_dir(prom_path)}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            f.write(run.to_prometheus())
+        os.replace(tmp_path, prom_path)
+        return True
+    except Exception as e:
+        logger.error(f"Error exporting run metrics: {str(e)}")
+        return False
+
+
+def load_recent_runs(limit=20, jsonl_path=METRICS_JSONL_FILE):
+    try:
+        if not os.path.exists(jsonl_path):
+            return []
+        with open(jsonl_path, encoding="utf-8") as f:
+            lines = f.readlines()[-limit:]
+        return [json.loads(line) for line in lines if line.strip()]
+    except Exception as e:
+        logger.error(f"Error loading run metrics: {str(e)}")
+        return []
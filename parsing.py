@@ -0,0 +1,122 @@
+import importlib.util
+import logging
+
+from metrics import count, span
+
+# lxml is imported on first parse, not here: browser imports this module for the class names
+# below, and the CLI and the scheduler daemon import browser without ever parsing HTML
+HTML_PARSER = 'lxml' if importlib.util.find_spec("lxml") else 'html.parser'
+
+
+logger = logging.getLogger(__name__)
+
+# Class names used by LinkedIn's people search results
+RESULT_CONTAINER_CLASS = 'tDfphBmQslIXKQzHkydHYPMOKfvxiBLINLOBw'
+PROFILE_LINK_CLASS = 'onRHPXypfWLuNOCinrLJfqDJJJaXLBUXSKz'
+HEADLINE_CLASS = 'TmhqKVgxpVFoDdYnKiMIkkTPeoywzixNLXovdrw'
+LOCATION_CLASS = 'eDoCapdtCHaaqGmFnsIyAPMKjrgPGOOrQ'
+
+def _has_class(name):
+    return f"contains(concat(' ', normalize-space(@class), ' '), ' {name} ')"
+
+
+# XPath equivalents of the BeautifulSoup lookups in extract_profile
+RESULT_CONTAINER_XPATH = f"//li[{_has_class(RESULT_CONTAINER_CLASS)}]"
+PROFILE_LINK_XPATH = f".//a[{_has_class(PROFILE_LINK_CLASS)} and @data-test-app-aware-link]"
+NAME_XPATH = ".//span[@aria-hidden='true']"
+HEADLINE_XPATH = f".//div[{_has_class(HEADLINE_CLASS)}]"
+LOCATION_XPATH = f".//div[{_has_class(LOCATION_CLASS)}]"
+
+
+def _text(element):
+    # Same result as BeautifulSoup's get_text(strip=True): comments skipped, pieces stripped and joined
+    return "".join(piece.strip() for piece in element.xpath(".//text()") if piece.strip())
+
+
+def _first(element, xpath):
+    matches = element.xpath(xpath)
+    return matches[0] if matches else None
+
+
+def extract_profile(container):
+    # Extract profile URL
+    profile_link = container.find('a', {
+        'class': PROFILE_LINK_CLASS,
+        'data-test-app-aware-link': True
+    })
+
+    if not profile_link or not profile_link.get('href'):
+        return None
+
+    profile_url = profile_link['href'].split('?')[0]  # Clean URL
+
+    # Extract profile name
+    name_span = profile_link.find('span', {'aria-hidden': 'true'})
+    profile_name = name_span.get_text(strip=True) if name_span else "Unknown"
+
+    # Extract headline
+    headline_div = container.find('div', class_=HEADLINE_CLASS)
+    headline = headline_div.get_text(strip=True) if headline_div else ""
+
+    # Extract location
+    location_div = container.find('div', class_=LOCATION_CLASS)
+    location = location_div.get_text(strip=True) if location_div else ""
+
+    return {
+        'name': profile_name,
+        'url': profile_url,
+        'headline': headline,
+        'location': location
+    }
+
+
+def extract_profile_lxml(container):
+    profile_link = _first(container, PROFILE_LINK_XPATH)
+    if profile_link is None or not profile_link.get('href'):
+        return None
+
+    name_span = _first(profile_link, NAME_XPATH)
+    headline_div = _first(container, HEADLINE_XPATH)
+    location_div = _first(container, LOCATION_XPATH)
+
+    return {
+        'name': _text(name_span) if name_span is not None else "Unknown",
+        'url': profile_link.get('href').split('?')[0],
+        'headline': _text(headline_div) if headline_div is not None else "",
+        'location': _text(location_div) if location_div is not None else ""
+    }
+
+
+def _profile_containers(html_content):
+    if HTML_PARSER == 'lxml':
+        import lxml.html
+
+        # libxml2 builds the tree in C; only the matched containers become Python objects
+        document = lxml.html.fromstring(html_content)
+        return document.xpath(RESULT_CONTAINER_XPATH), extract_profile_lxml
+    # Fallback engine: only the result <li> containers are turned into soup nodes. bs4 is
+    # imported here since most installs never need it
+    from bs4 import BeautifulSoup, SoupStrainer
+    strainer = SoupStrainer('li', class_=RESULT_CONTAINER_CLASS)
+    soup = BeautifulSoup(html_content, HTML_PARSER, parse_only=strainer)
+    return soup.find_all('li', class_=RESULT_CONTAINER_CLASS), extract_profile
+
+
+def extract_profiles_from_html(html_content):
+    profiles = []
+    if not html_content:
+        return profiles
+
+    with span("parse"):
+        containers, extract = _profile_containers(html_content)
+        for container in containers:
+            try:
+                profile = extract(container)
+                if profile:
+                    profiles.append(profile)
+            except Exception as e:
+                logger.warning(f"Error extracting profile: {str(e)}")
+                continue
+
+    count("parsed_profiles", len(profiles))
+    return profiles
@@ -0,0 +1,12 @@
+import os
+
+
+# Constants
+# Ledger, sessions, schedules, journal, metrics and caches all live under this directory
+BASE_DIR = os.environ.get("LINKEDIN_DATA_DIR", os.path.dirname(os.path.abspath(__file__)))
+
+
+def ensure_parent_dir(path):
+    # LINKEDIN_DATA_DIR may name a directory that does not exist yet
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    return path
@@ -0,0 +1,212 @@
+"""Daily scheduled runs, persisted to disk and run outside any Streamlit session.
+
+Runs in the Streamlit process (start_scheduler) or on its own with `python scheduler.py`;
+a lock file makes sure only one process fires the schedules.
+"""
+import json
+import logging
+import os
+import threading
+import uuid
+from datetime import datetime, timedelta
+
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+
+from paths import BASE_DIR, ensure_parent_dir
+from search_cache import SEARCH_CACHE_HOURS
+
+
+logger = logging.getLogger(__name__)
+
+# Constants
+SCHEDULES_FILE = os.path.join(BASE_DIR, "schedules.json")
+SCHEDULER_LOCK_FILE = os.path.join(BASE_DIR, ".scheduler.lock")
+MAX_SLEEP = 60  # longest sleep between looks at the schedule file, so edits from other processes are seen
+PASSWORD_ENV = "LINKEDIN_PASSWORD"  # only needed when the saved browser session has expired
+
+
+def load_schedules(path=SCHEDULES_FILE):
+    try:
+        if os.path.exists(path):
+            with open(path, encoding="utf-8") as f:
+                return json.load(f)
+    except Exception as e:
+        logger.error(f"Error loading schedules: {str(e)}")
+    return []
+
+
+def save_schedules(schedules, path=SCHEDULES_FILE):
+    # Written atomically and readable only by the owner: schedules hold the message and email
+    try:
+        tmp_path = f"{ensure_parent_dir(path)}.tmp"
+        with open(os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600), "w", encoding="utf-8") as f:
+            json.dump(schedules, f, indent=2)
+        os.replace(tmp_path, path)
+        return True
+    except Exception as e:
+        logger.error(f"Error saving schedules: {str(e)}")
+        return False
+
+
+def add_schedule(hour, minute, title, message, email, max_messages, delay_between_messages,
+                 manual_captcha=False, allowed_resources=(), search_cache_hours=SEARCH_CACHE_HOURS,
+                 path=SCHEDULES_FILE):
+    schedule = {
+        'id': uuid.uuid4().hex[:12],
+        'hour': int(hour),
+        'minute': int(minute),
+        'title': title,
+        'message': message,
+        'email': email,
+        'max_messages': int(max_messages),
+        'delay_between_messages': int(delay_between_messages),
+        'manual_captcha': bool(manual_captcha),
+        'allowed_resources': list(allowed_resources),
+        'search_cache_hours': int(search_cache_hours),
+        'created_at': datetime.now().isoformat(timespec="seconds"),
+        'last_run': None,
+    }
+    schedules = load_schedules(path)
+    schedules.append(schedule)
+    return schedule if save_schedules(schedules, path) else None
+
+
+def remove_schedule(schedule_id=None, path=SCHEDULES_FILE):
+    # Removes one schedule, or all of them when no id is given
+    schedules = [schedule for schedule in load_schedules(path)
+                 if schedule_id is not None and schedule['id'] != schedule_id]
+    return save_schedules(schedules, path)
+
+
+def next_due(schedule):
+    # First hh:mm after the schedule was created or last run; in the past if a run is owed
+    baseline = datetime.fromisoformat(schedule['last_run'] or schedule['created_at'])
+    due = baseline.replace(hour=schedule['hour'], minute=schedule['minute'], second=0, microsecond=0)
+    if due <= baseline:
+        due += timedelta(days=1)
+    return due
+
+
+def mark_run(schedule_id, when, path=SCHEDULES_FILE):
+    schedules = load_schedules(path)
+    for schedule in schedules:
+        if schedule['id'] == schedule_id:
+            schedule['last_run'] = when.isoformat(timespec="seconds")
+    return save_schedules(schedules, path)
+
+
+def run_schedule(schedule, runner):
+    # Imported here so that loading and editing schedules doesn't pull in Selenium
+    from automation import search_and_send_messages
+
+    password = os.environ.get(PASSWORD_ENV, "")
+    if not password:
+        logger.warning(f"{PASSWORD_ENV} is not set; the scheduled run relies on the saved LinkedIn session")
+    return runner.submit(
+        search_and_send_messages, schedule['title'], schedule['message'], schedule['email'], password,
+        max_messages=schedule['max_messages'], delay_between_messages=schedule['delay_between_messages'],
+        manual_captcha=schedule['manual_captcha'], allowed_resources=tuple(schedule['allowed_resources']),
+        search_cache_hours=schedule.get('search_cache_hours', SEARCH_CACHE_HOURS),  # absent in older schedules
+        label=f"Scheduled: {schedule['title']}")
+
+
+class Scheduler:
+    """Sleeps until the next schedule is due, then hands the run to a JobRunner.
+
+    A run is recorded as done before it is submitted, so a crash mid-run never repeats it.
+    Runs missed while nothing was running (a restart, a sleeping laptop) fire once as soon
+    as the scheduler is back; further missed days are not caught up.
+    """
+
+    def __init__(self, runner, path=SCHEDULES_FILE):
+        self.runner = runner
+        self.path = path
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+
+    def wake(self):
+        # Call after editing the schedules so the new next due time is picked up right away
+        self._wake.set()
+
+    def stop(self):
+        self._stop.set()
+        self._wake.set()
+
+    def run_due(self, now=None):
+        # Fires every schedule that is due; returns the seconds until the next one (or None)
+        now = now or datetime.now()
+        waits = []
+        for schedule in load_schedules(self.path):
+            due = next_due(schedule)
+            if due <= now:
+                logger.info(f"Running schedule {schedule['id']} ({schedule['title']}) due at {due:%Y-%m-%d %H:%M}")
+                if mark_run(schedule['id'], now, self.path):
+                    run_schedule(schedule, self.runner)
+                due = next_due({**schedule, 'last_run': now.isoformat(timespec="seconds")})
+            waits.append((due - now).total_seconds())
+        return min(waits) if waits else None
+
+    def run_forever(self):
+        while not self._stop.is_set():
+            try:
+                wait = self.run_due()
+            except Exception as e:
+                logger.error(f"Scheduler error: {str(e)}")
+                wait = None
+            self._wake.clear()
+            self._wake.wait(MAX_SLEEP if wait is None else min(max(wait, 0), MAX_SLEEP))
+
+
+def acquire_scheduler_lock(path=SCHEDULER_LOCK_FILE):
+    # Returns an open lock file while this process owns the schedules, else None
+    lock_file = open(ensure_parent_dir(path), "a")
+    if fcntl is None:
+        return lock_file
+    try:
+        fcntl.flock(lock_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        return lock_file
+    except OSError:
+        lock_file.close()
+        return None
+
+
+# One scheduler per process, shared by every Streamlit session
+_scheduler = None
+_scheduler_lock = threading.Lock()
+
+
+def start_scheduler(runner):
+    """Start the scheduler thread in this process; None if another process already runs one."""
+    global _scheduler
+    with _scheduler_lock:
+        if _scheduler is None:
+            lock_file = acquire_scheduler_lock()
+            if lock_file is None:
+                return None
+            _scheduler = Scheduler(runner)
+            _scheduler.lock_file = lock_file
+            threading.Thread(target=_scheduler.run_forever, name="scheduler", daemon=True).start()
+        return _scheduler
+
+
+def main():
+    logging.basicConfig(level=logging.INFO)
+    from jobs import JobRunner
+
+    lock_file = acquire_scheduler_lock()
+    if lock_file is None:
+        logger.error("Another scheduler is already running for this data directory")
+        return 1
+    logger.info(f"Scheduler started with {len(load_schedules())} schedules from {SCHEDULES_FILE}")
+    try:
+        Scheduler(JobRunner()).run_forever()
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
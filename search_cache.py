@@ -0,0 +1,77 @@
+import hashlib
+import json
+import logging
+import os
+import shutil
+from datetime import datetime, timedelta
+
+from checkpoints import CANDIDATE_FIELDS
+from paths import BASE_DIR
+
+
+logger = logging.getLogger(__name__)
+
+# Constants
+SEARCH_CACHE_DIR = os.path.join(BASE_DIR, ".search_cache")
+SEARCH_CACHE_HOURS = 72  # 1st-degree connections barely change from one day to the next
+
+
+def search_cache_path(email, title, filters):
+    # One entry per account, search title and set of result filters
+    key = "\n".join([email.strip().lower(), title.strip().lower()] + sorted(filters))
+    return os.path.join(SEARCH_CACHE_DIR, f"{hashlib.sha256(key.encode('utf-8')).hexdigest()[:16]}.json")
+
+
+def save_search_results(email, title, filters, profiles):
+    """Cache the profiles a search returned (without their live button elements)."""
+    try:
+        os.makedirs(SEARCH_CACHE_DIR, mode=0o700, exist_ok=True)
+        path = search_cache_path(email, title, filters)
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump({
+                'title': title,
+                'filters': list(filters),
+                'saved_at': datetime.now().isoformat(timespec="seconds"),
+                'profiles': [{field: profile.get(field) for field in CANDIDATE_FIELDS} for profile in profiles],
+            }, f)
+        os.replace(tmp_path, path)
+        return True
+    except Exception as e:
+        logger.error(f"Error caching search results: {str(e)}")
+        return False
+
+
+def load_search_entry(email, title, filters):
+    try:
+        path = search_cache_path(email, title, filters)
+        if os.path.exists(path):
+            with open(path, encoding="utf-8") as f:
+                entry = json.load(f)
+            entry['saved_at'] = datetime.fromisoformat(entry['saved_at'])
+            return entry
+    except Exception as e:
+        logger.warning(f"Ignoring unreadable search cache entry: {str(e)}")
+    return None
+
+
+def load_search_results(email, title, filters, max_age_hours=SEARCH_CACHE_HOURS, now=None):
+    # The cached profiles, or None when there are none younger than max_age_hours
+    entry = load_search_entry(email, title, filters)
+    if entry is None or (now or datetime.now()) - entry['saved_at'] > timedelta(hours=max_age_hours):
+        return None
+    return entry['profiles']
+
+
+def invalidate_search_results(email=None, title=None, filters=()):
+    # Drops one entry, or the whole cache when no title is given
+    if title is None:
+        if os.path.isdir(SEARCH_CACHE_DIR):
+            shutil.rmtree(SEARCH_CACHE_DIR)
+            return True
+        return False
+    path = search_cache_path(email, title, filters)
+    if os.path.exists(path):
+        os.remove(path)
+        return True
+    return False
@@ -0,0 +1,230 @@
+import hashlib
+import io
+import logging
+import os
+import shutil
+import tarfile
+import time
+from urllib.parse import urlparse
+
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+
+from paths import BASE_DIR
+
+
+logger = logging.getLogger(__name__)
+
+# Constants
+SESSIONS_DIR = os.path.join(BASE_DIR, ".sessions")
+# Point at a local stand-in server (benchmarks/standin_server.py) to run without the live site
+LINKEDIN_BASE_URL = os.environ.get("LINKEDIN_BASE_URL", "https://www.linkedin.com").rstrip("/")
+LOGIN_URL = f"{LINKEDIN_BASE_URL}/login"
+FEED_URL = f"{LINKEDIN_BASE_URL}/feed/"
+SESSION_PROBE_TIMEOUT = 8
+LOGGED_OUT_MARKERS = ("/login", "/authwall", "/uas/", "/checkpoint/")
+SESSION_LOCK_TIMEOUT = 3600  # longest wait for another process's run on the same account
+SESSION_LOCK_POLL = 5
+# Saved sessions are encrypted with a key derived from this passphrase between runs; without
+# it, nothing is kept and every run logs in again
+SESSION_KEY_ENV = "LINKEDIN_SESSION_KEY"
+SEALED_SESSION_MAGIC = b"LISESS1\n"
+SESSION_SALT_BYTES = 16
+SESSION_NONCE_BYTES = 12
+# Left out of sealed sessions: Chrome's caches (large, and no credentials in them) and the
+# Singleton* lock files and symlinks of a running browser
+UNSEALED_PROFILE_ENTRIES = ("Cache", "Code Cache", "GPUCache", "DawnCache", "GraphiteDawnCache",
+                            "GrShaderCache", "ShaderCache", "SingletonLock", "SingletonCookie",
+                            "SingletonSocket")
+
+
+def site_url(url):
+    # The same page on LINKEDIN_BASE_URL; a no-op against the live site
+    parsed = urlparse(url)
+    return f"{LINKEDIN_BASE_URL}{parsed.path}" + (f"?{parsed.query}" if parsed.query else "")
+
+
+def session_profile_dir(email):
+    # One Chrome profile per account; the directory name is a hash so the email is not on disk
+    key = hashlib.sha256(email.strip().lower().encode("utf-8")).hexdigest()[:16]
+    return os.path.join(SESSIONS_DIR, key)
+
+
+def sealed_session_path(email):
+    return f"{session_profile_dir(email)}.sealed"
+
+
+def _session_cipher(passphrase, salt):
+    # AES-256-GCM with a scrypt-derived key; imported here, since only runs that save sessions need it
+    try:
+        from cryptography.hazmat.primitives.ciphers.aead import AESGCM
+    except ImportError:
+        raise RuntimeError(f"{SESSION_KEY_ENV} is set but the cryptography package is not installed")
+    return AESGCM(hashlib.scrypt(passphrase.encode("utf-8"), salt=salt, n=2 ** 14, r=8, p=1, dklen=32))
+
+
+def _unsealed_entry(member):
+    # tarfile filter: drops caches and lock files, and anything that isn't a file or directory
+    if set(member.name.split("/")) & set(UNSEALED_PROFILE_ENTRIES) or not (member.isfile() or member.isdir()):
+        return None
+    return member
+
+
+def seal_session(email):
+    """Encrypt the account's browser profile into its .sealed file and delete the plain directory.
+
+    Called once the browser has quit. Without LINKEDIN_SESSION_KEY the profile is only deleted,
+    so no logged-in session is left on disk either way. Returns True if a sealed copy was written.
+    """
+    profile_dir = session_profile_dir(email)
+    if not os.path.isdir(profile_dir):
+        return False
+    passphrase = os.environ.get(SESSION_KEY_ENV, "")
+    try:
+        if passphrase:
+            buffer = io.BytesIO()
+            with tarfile.open(fileobj=buffer, mode="w:gz") as archive:
+                archive.add(profile_dir, arcname=".", filter=_unsealed_entry)
+            salt, nonce = os.urandom(SESSION_SALT_BYTES), os.urandom(SESSION_NONCE_BYTES)
+            header = SEALED_SESSION_MAGIC + salt + nonce
+            sealed = header + _session_cipher(passphrase, salt).encrypt(nonce, buffer.getvalue(), header)
+            path = sealed_session_path(email)
+            tmp_path = f"{path}.tmp"
+            with os.fdopen(os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600), "wb") as f:
+                f.write(sealed)
+            os.replace(tmp_path, path)
+        shutil.rmtree(profile_dir, ignore_errors=True)
+        return bool(passphrase)
+    except Exception as e:
+        # The plain profile is kept, so the next run can still seal it
+        logger.error(f"Error sealing the saved session: {str(e)}")
+        return False
+
+
+def unseal_session(email):
+    # Restores the profile directory from its .sealed file; False when there is nothing to restore
+    path = sealed_session_path(email)
+    profile_dir = session_profile_dir(email)
+    # A plain directory is left by a run that crashed after unsealing, and is the newer copy
+    if not os.path.exists(path) or os.path.isdir(profile_dir):
+        return False
+    passphrase = os.environ.get(SESSION_KEY_ENV, "")
+    if not passphrase:
+        logger.warning(f"The saved session is sealed but {SESSION_KEY_ENV} is not set; logging in again")
+        return False
+    try:
+        with open(path, "rb") as f:
+            sealed = f.read()
+        header_size = len(SEALED_SESSION_MAGIC) + SESSION_SALT_BYTES + SESSION_NONCE_BYTES
+        header = sealed[:header_size]
+        if not header.startswith(SEALED_SESSION_MAGIC):
+            raise ValueError("not a sealed session file")
+        salt = header[len(SEALED_SESSION_MAGIC):len(SEALED_SESSION_MAGIC) + SESSION_SALT_BYTES]
+        nonce = header[-SESSION_NONCE_BYTES:]
+        archive = _session_cipher(passphrase, salt).decrypt(nonce, sealed[header_size:], header)
+        os.makedirs(profile_dir, mode=0o700)
+        with tarfile.open(fileobj=io.BytesIO(archive), mode="r:gz") as tar:
+            tar.extractall(profile_dir, filter="data")
+        return True
+    except RuntimeError:
+        raise
+    except Exception as e:
+        # Wrong key or a damaged file: start from a fresh profile (and log in) instead
+        shutil.rmtree(profile_dir, ignore_errors=True)
+        logger.warning(f"Could not unseal the saved session, logging in again: {str(e) or type(e).__name__}")
+        return False
+
+
+def use_saved_session(chrome_options, email):
+    """Point Chrome at the account's profile so cookies and HTTP cache survive the run.
+
+    Between runs the profile only exists sealed (see seal_session): encrypted with a key derived
+    from LINKEDIN_SESSION_KEY, or not at all when that is unset. The plain directory, owner-only
+    (0700), exists while a run holds the account's session lock.
+    """
+    if unseal_session(email):
+        logger.info("Unsealed the saved session")
+    elif not os.environ.get(SESSION_KEY_ENV):
+        logger.info(f"{SESSION_KEY_ENV} is not set; the browser session is deleted when the run ends")
+    profile_dir = session_profile_dir(email)
+    os.makedirs(profile_dir, mode=0o700, exist_ok=True)
+    os.chmod(SESSIONS_DIR, 0o700)
+    os.chmod(profile_dir, 0o700)
+    chrome_options.add_argument(f"--user-data-dir={profile_dir}")
+    return profile_dir
+
+
+def try_lock_session(email):
+    # Returns an open lock file while this process owns the account's browser profile, else None
+    os.makedirs(SESSIONS_DIR, mode=0o700, exist_ok=True)
+    lock_file = open(f"{session_profile_dir(email)}.lock", "a")
+    if fcntl is None:
+        return lock_file
+    try:
+        fcntl.flock(lock_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        return lock_file
+    except OSError:
+        lock_file.close()
+        return None
+
+
+def lock_session(email, job, timeout=SESSION_LOCK_TIMEOUT):
+    """Wait until no other process (the app, the scheduler daemon, `cli.py run`) has a browser
+    open on this account's profile, then hold it until unlock_session.
+
+    Chrome refuses a second launch on a locked --user-data-dir, and two runs must not drive one
+    account at once. Returns None if the job was cancelled while waiting; raises RuntimeError
+    after `timeout` seconds.
+    """
+    lock_file = try_lock_session(email)
+    if lock_file is not None:
+        return lock_file
+    job.emit('warning', "Another run is using this account's browser session; waiting for it to finish")
+    deadline = time.monotonic() + timeout
+    while lock_file is None:
+        if job.cancelled:
+            return None
+        if time.monotonic() > deadline:
+            raise RuntimeError(f"The account's browser session was still in use after {timeout // 60} minutes")
+        time.sleep(SESSION_LOCK_POLL)
+        lock_file = try_lock_session(email)
+    return lock_file
+
+
+def unlock_session(lock_file):
+    if lock_file is not None:
+        lock_file.close()  # closing the file releases the flock
+
+
+def is_logged_in(driver, timeout=SESSION_PROBE_TIMEOUT):
+    from selenium.common.exceptions import TimeoutException
+    from selenium.webdriver.common.by import By
+    from selenium.webdriver.support import expected_conditions as EC
+    from selenium.webdriver.support.ui import WebDriverWait
+
+    # Cheap probe: open the feed and see whether the search bar shows up before a login redirect
+    try:
+        driver.get(FEED_URL)
+        WebDriverWait(driver, timeout).until(
+            lambda d: any(marker in d.current_url.lower() for marker in LOGGED_OUT_MARKERS) or
+                      EC.presence_of_element_located((By.XPATH, "//input[@aria-label='Search']"))(d))
+        logged_in = not any(marker in driver.current_url.lower() for marker in LOGGED_OUT_MARKERS)
+        logger.info("Reusing saved session" if logged_in else "Saved session expired")
+        return logged_in
+    except TimeoutException:
+        return False
+    except Exception as e:
+        logger.warning(f"Session probe failed: {str(e)}")
+        return False
+
+
+def clear_saved_session(email):
+    profile_dir = session_profile_dir(email)
+    sealed_path = sealed_session_path(email)
+    found = os.path.exists(profile_dir) or os.path.exists(sealed_path)
+    shutil.rmtree(profile_dir, ignore_errors=True)
+    if os.path.exists(sealed_path):
+        os.remove(sealed_path)
+    return found